@@ -0,0 +1,146 @@
+from collections import deque
+from typing import (Deque, Dict, Hashable, List, Optional, Set, Tuple,
+                    Union)
+
+from homework import InfoMessage, Training
+
+METRICS: Tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+DAY: float = 24 * 60 * 60
+
+
+class Stats:
+    """Накопленные сумма, количество, минимум и максимум показателя."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.minimum: float = float('inf')
+        self.maximum: float = float('-inf')
+
+    def __repr__(self) -> str:
+        return (f'Stats(count={self.count}, total={self.total}, '
+                f'minimum={self.minimum}, maximum={self.maximum})')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Stats):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение показателя."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, value: float) -> None:
+        """Учесть новое значение показателя."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: 'Stats') -> None:
+        """Добавить накопленные значения другого окна."""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class RollingAggregator:
+    """Накопление статистики тренировок по ключам и окнам времени.
+
+    Время — секунды от начала эпохи, окна длиной `window` не
+    пересекаются. Хранятся только последние `retention` окон: когда
+    приходит тренировка из нового окна, самые старые окна удаляются,
+    а более ранние тренировки отбрасываются. Добавление тренировки
+    стоит O(1), запрос — O(число окон в диапазоне).
+    """
+
+    def __init__(self, window: float = DAY, retention: int = 30) -> None:
+        if window <= 0 or retention < 1:
+            raise ValueError('Окно и срок хранения должны быть положительными')
+        self.window: float = window
+        self.retention: int = retention
+        self.windows: Dict[Tuple[Hashable, float], Dict[str, Stats]] = {}
+        self._starts: Deque[float] = deque()
+        self._keys: Dict[float, Set[Hashable]] = {}
+
+    def window_start(self, timestamp: float) -> float:
+        """Получить начало окна, в которое попадает момент времени."""
+        return timestamp - timestamp % self.window
+
+    def add(self,
+            key: Hashable,
+            timestamp: float,
+            workout: Union[InfoMessage, Training],
+            ) -> bool:
+        """Учесть тренировку; вернуть False, если её окно уже удалено."""
+        if isinstance(workout, Training):
+            workout = workout.show_training_info()
+        start = self.window_start(timestamp)
+        if start not in self._keys:
+            if self._starts and start <= self._horizon():
+                return False
+            self._open(start)
+        stats = self.windows.get((key, start))
+        if stats is None:
+            stats = self.windows[key, start] = {
+                metric: Stats() for metric in METRICS}
+            self._keys[start].add(key)
+        for metric in METRICS:
+            stats[metric].add(getattr(workout, metric))
+        return True
+
+    def _open(self, start: float) -> None:
+        """Завести новое окно и удалить окна за пределами хранения."""
+        self._keys[start] = set()
+        if not self._starts or start > self._starts[-1]:
+            self._starts.append(start)
+        else:
+            # Окна приходят почти по порядку, вставка редкая.
+            self._starts = deque(sorted((*self._starts, start)))
+        horizon = self._horizon()
+        while self._starts[0] <= horizon:
+            self.expire(self._starts[0])
+
+    def _horizon(self) -> float:
+        """Получить начало последнего окна, вышедшего за срок хранения."""
+        return self._starts[-1] - self.retention * self.window
+
+    def expire(self, start: float) -> None:
+        """Удалить окно со статистикой всех ключей."""
+        self._starts.remove(start)
+        for key in self._keys.pop(start):
+            del self.windows[key, start]
+
+    def query(self,
+              key: Hashable,
+              metric: str,
+              start: Optional[float] = None,
+              end: Optional[float] = None,
+              ) -> Stats:
+        """Получить статистику показателя ключа за окна в диапазоне.
+
+        Учитываются окна, начало которых лежит в ``[start, end)``.
+        """
+        if metric not in METRICS:
+            raise ValueError(f'Неизвестный показатель: {metric}')
+        result = Stats()
+        for window_start in self._starts:
+            if start is not None and window_start < start:
+                continue
+            if end is not None and window_start >= end:
+                break
+            stats = self.windows.get((key, window_start))
+            if stats is not None:
+                result.merge(stats[metric])
+        return result
+
+    def keys(self) -> List[Hashable]:
+        """Получить ключи, по которым есть статистика."""
+        return list({key for key, _ in self.windows})
@@ -0,0 +1,329 @@
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+from typing import IO, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from homework import (BASE_FIELDS, TRAINING_TYPES, BatchResult, InfoMessage,
+                      calculate_batch, iter_batch_messages)
+from streaming import Record
+
+MAGIC: bytes = b'WKTA'
+VERSION: int = 1
+BLOCK_SIZE: int = 16384
+LEVEL: int = 6
+FILE_HEADER = struct.Struct('<4sHH')
+INDEX_ENTRY = struct.Struct('<BIQI')
+FOOTER = struct.Struct('<QI4s')
+RAW: int = 0
+DICTIONARY: int = 1
+DELTA: int = 2
+MAX_DICTIONARY: int = 256
+
+BlockInfo = namedtuple('BlockInfo',
+                       ('workout_type', 'count', 'offset', 'size', 'start'))
+Column = Sequence[float]
+
+
+def _to_bytes(values: array) -> bytes:
+    """Получить байты массива в порядке little-endian."""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: memoryview) -> array:
+    """Прочитать массив из байт в порядке little-endian."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def encode_column(values: Sequence[float]) -> bytes:
+    """Закодировать столбец блока.
+
+    Целые столбцы хранятся разностями соседних значений, столбцы
+    не больше чем с 256 различными значениями — словарём и номерами,
+    остальные — значениями ``float64``. Значения сравниваются по битам,
+    поэтому 0.0 и -0.0 не смешиваются.
+    """
+    if all(value.__class__ is int for value in values):
+        try:
+            deltas = array('q', [values[0]])
+            deltas.extend(b - a for a, b in zip(values, values[1:]))
+        except OverflowError:
+            pass
+        else:
+            return bytes((DELTA,)) + _to_bytes(deltas)
+    try:
+        column = array('d', values)
+    except TypeError:
+        raise ValueError('Неверные данные') from None
+    bits = array('Q')
+    bits.frombytes(column.tobytes())
+    dictionary: Dict[int, int] = {}
+    for value in bits:
+        if value not in dictionary:
+            if len(dictionary) == MAX_DICTIONARY:
+                return bytes((RAW,)) + _to_bytes(column)
+            dictionary[value] = len(dictionary)
+    indexes = array('B', map(dictionary.__getitem__, bits))
+    return (bytes((DICTIONARY, len(dictionary) - 1))
+            + _to_bytes(array('Q', dictionary)) + indexes.tobytes())
+
+
+def decode_column(data: memoryview,
+                  offset: int,
+                  count: int,
+                  ) -> Tuple[Column, int]:
+    """Раскодировать столбец блока; вернуть его и смещение за ним."""
+    encoding = data[offset]
+    offset += 1
+    if encoding == DELTA:
+        deltas = _from_bytes('q', data[offset:offset + 8 * count])
+        return list(accumulate(deltas)), offset + 8 * count
+    if encoding == DICTIONARY:
+        size = data[offset] + 1
+        offset += 1
+        values = _from_bytes('d', data[offset:offset + 8 * size])
+        offset += 8 * size
+        indexes = data[offset:offset + count]
+        return array('d', map(values.__getitem__, indexes)), offset + count
+    if encoding == RAW:
+        return _from_bytes('d', data[offset:offset + 8 * count]), (
+            offset + 8 * count)
+    raise ValueError('Неверный формат архива тренировок')
+
+
+def _fields(workout_type: str) -> Tuple[str, ...]:
+    return BASE_FIELDS + TRAINING_TYPES[workout_type].EXTRA_FIELDS
+
+
+class ArchiveWriter:
+    """Запись пакетов тренировок в сжатый архив.
+
+    Пакеты раскладываются по типам тренировок; блок из `block_size`
+    пакетов одного типа кодируется по столбцам (`encode_column`)
+    и сжимается zlib. В конце файла — индекс блоков для произвольного
+    доступа. Внутри архива пакеты идут блоками по типам, а не
+    в порядке записи.
+    """
+
+    def __init__(self,
+                 file: Union[str, IO[bytes]],
+                 block_size: int = BLOCK_SIZE,
+                 level: int = LEVEL,
+                 ) -> None:
+        self.codes: List[str] = list(TRAINING_TYPES)
+        if len(self.codes) > 255:
+            raise ValueError('Слишком много типов тренировок')
+        self.code_index: Dict[str, int] = {
+            code: index for index, code in enumerate(self.codes)}
+        self.block_size: int = block_size
+        self.level: int = level
+        self.owned: bool = isinstance(file, str)
+        self.file: IO[bytes] = open(file, 'wb') if self.owned else file
+        self.buffers: Dict[str, List[List[float]]] = {}
+        self.index: List[bytes] = []
+        self.offset: int = 0
+        self.closed: bool = False
+        header = bytearray(FILE_HEADER.pack(MAGIC, VERSION, len(self.codes)))
+        for code in self.codes:
+            encoded = code.encode('utf-8')
+            header += bytes((len(encoded),)) + encoded
+        self._write(bytes(header))
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.offset += len(data)
+
+    def write(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить пакет тренировки."""
+        if workout_type not in self.code_index:
+            raise ValueError('Неверные данные')
+        columns = self.buffers.get(workout_type)
+        if columns is None:
+            columns = self.buffers[workout_type] = [
+                [] for _ in _fields(workout_type)]
+        if len(data) != len(columns):
+            raise ValueError('Неверные данные')
+        for column, value in zip(columns, data):
+            column.append(value)
+        if len(columns[0]) >= self.block_size:
+            self.flush(workout_type)
+
+    def write_many(self, records: Iterable[Record]) -> None:
+        """Добавить пакеты тренировок."""
+        for workout_type, data in records:
+            self.write(workout_type, data)
+
+    def flush(self, workout_type: str) -> None:
+        """Сжать и записать накопленный блок одного типа."""
+        columns = self.buffers.pop(workout_type, None)
+        if not columns or not columns[0]:
+            return
+        payload = b''.join(map(encode_column, columns))
+        compressed = zlib.compress(payload, self.level)
+        self.index.append(INDEX_ENTRY.pack(
+            self.code_index[workout_type], len(columns[0]), self.offset,
+            len(compressed)))
+        self._write(compressed)
+
+    def close(self) -> None:
+        """Записать оставшиеся блоки, индекс и закрыть файл."""
+        if self.closed:
+            return
+        self.closed = True
+        for workout_type in self.codes:
+            self.flush(workout_type)
+        index_offset = self.offset
+        self._write(b''.join(self.index))
+        self._write(FOOTER.pack(index_offset, len(self.index), MAGIC))
+        if self.owned:
+            self.file.close()
+
+
+class ArchiveFile:
+    """Чтение архива тренировок.
+
+    При открытии читается только индекс блоков. Блоки распаковываются
+    по одному при обращении, поэтому память потокового чтения
+    ограничена одним блоком. Последний прочитанный блок запоминается
+    для произвольного доступа к соседним пакетам.
+    """
+
+    def __init__(self, file: Union[str, IO[bytes]]) -> None:
+        self.owned: bool = isinstance(file, str)
+        self.file: IO[bytes] = open(file, 'rb') if self.owned else file
+        self.codes: List[str] = []
+        self.blocks: List[BlockInfo] = []
+        self._starts: List[int] = []
+        self._cached: Tuple[int, List[Column]] = (-1, [])
+        try:
+            self._read_index()
+        except (struct.error, IndexError, UnicodeDecodeError):
+            self.close()
+            raise ValueError('Неверный формат архива тренировок') from None
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'ArchiveFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        if not self.blocks:
+            return 0
+        last = self.blocks[-1]
+        return last.start + last.count
+
+    def _read_index(self) -> None:
+        file = self.file
+        file.seek(0)
+        magic, version, code_count = FILE_HEADER.unpack(
+            file.read(FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Неверный формат архива тренировок')
+        for _ in range(code_count):
+            size = file.read(1)[0]
+            self.codes.append(file.read(size).decode('utf-8'))
+        file.seek(-FOOTER.size, 2)
+        index_offset, count, magic = FOOTER.unpack(file.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError('Архив тренировок обрезан')
+        file.seek(index_offset)
+        start = 0
+        for entry in INDEX_ENTRY.iter_unpack(
+                file.read(INDEX_ENTRY.size * count)):
+            code, records, offset, size = entry
+            self.blocks.append(
+                BlockInfo(self.codes[code], records, offset, size, start))
+            self._starts.append(start)
+            start += records
+
+    def read_block(self, number: int) -> List[Column]:
+        """Распаковать столбцы блока в порядке параметров тренировки."""
+        if self._cached[0] == number:
+            return self._cached[1]
+        block = self.blocks[number]
+        self.file.seek(block.offset)
+        try:
+            payload = memoryview(
+                zlib.decompress(self.file.read(block.size)))
+        except zlib.error:
+            raise ValueError('Блок архива тренировок повреждён') from None
+        columns = []
+        offset = 0
+        for _ in _fields(block.workout_type):
+            column, offset = decode_column(payload, offset, block.count)
+            columns.append(column)
+        self._cached = (number, columns)
+        return columns
+
+    def block_records(self, number: int) -> Iterator[Record]:
+        """Получить пакеты одного блока."""
+        workout_type = self.blocks[number].workout_type
+        for values in zip(*self.read_block(number)):
+            yield workout_type, list(values)
+
+    def records(self) -> Iterator[Record]:
+        """Получить все пакеты архива, распаковывая блоки по очереди."""
+        for number in range(len(self.blocks)):
+            yield from self.block_records(number)
+
+    def record(self, position: int) -> Record:
+        """Получить пакет по номеру в архиве."""
+        if not 0 <= position < len(self):
+            raise IndexError('Нет пакета с таким номером')
+        number = bisect_right(self._starts, position) - 1
+        block = self.blocks[number]
+        index = position - block.start
+        return block.workout_type, [
+            column[index] for column in self.read_block(number)]
+
+    def calculate(self) -> Iterator[BatchResult]:
+        """Рассчитать показатели блоков пакетным проходом."""
+        for number, block in enumerate(self.blocks):
+            columns = dict(zip(_fields(block.workout_type),
+                               self.read_block(number)))
+            yield calculate_batch([block.workout_type] * block.count,
+                                  **columns)
+
+    def messages(self) -> Iterator[InfoMessage]:
+        """Получить сообщения о тренировках всех блоков."""
+        for number, result in enumerate(self.calculate()):
+            block = self.blocks[number]
+            yield from iter_batch_messages(
+                [block.workout_type] * block.count,
+                self.read_block(number)[1], result)
+
+    def close(self) -> None:
+        """Закрыть файл архива."""
+        self._cached = (-1, [])
+        if self.owned:
+            self.file.close()
+
+
+def write_records(file: Union[str, IO[bytes]],
+                  records: Iterable[Record],
+                  block_size: int = BLOCK_SIZE,
+                  level: int = LEVEL,
+                  ) -> None:
+    """Записать пакеты тренировок в архив."""
+    with ArchiveWriter(file, block_size, level) as writer:
+        writer.write_many(records)
@@ -0,0 +1,311 @@
+"""Замеры скорости расчёта тренировок.
+
+Запуск: ``python benchmarks.py --sizes 1 1000 100000 --output new.json``;
+с ``--compare old.json`` результат сравнивается с прошлым запуском,
+и при замедлении больше ``--threshold`` программа завершается с кодом 1.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from archive import ArchiveFile, write_records
+from homework import (TRAINING_TYPES, Training, calculate_batch, main,
+                      read_package)
+from profiles import AthleteIndex
+from streaming import Record, to_columns
+from validation import validate_columns, validate_package
+
+SIZES: Tuple[int, ...] = (1, 10, 100, 1000, 10000, 100000)
+REPEAT: int = 3
+THRESHOLD: float = 0.1
+IMPORT_BUDGET_MS: float = 100
+SEED: int = 2021
+ATHLETES: int = 20
+
+Benchmark = Tuple[Callable[[List[Record]], Any], Callable[[Any], Any]]
+
+
+def generate_packages(count: int,
+                      workout_types: Sequence[str] = ('SWM', 'RUN', 'WLK'),
+                      seed: int = SEED,
+                      ) -> List[Record]:
+    """Сгенерировать воспроизводимый набор пакетов тренировок."""
+    rng = random.Random(seed)
+    generators = {
+        'SWM': lambda: [rng.randint(100, 3000), rng.uniform(0.2, 3),
+                        rng.uniform(40, 120), rng.choice((25, 50)),
+                        rng.randint(1, 80)],
+        'RUN': lambda: [rng.randint(500, 40000), rng.uniform(0.2, 5),
+                        rng.uniform(40, 120)],
+        'WLK': lambda: [rng.randint(500, 40000), rng.uniform(0.2, 5),
+                        rng.uniform(40, 120), rng.uniform(140, 210)],
+    }
+    return [(workout_type, generators[workout_type]())
+            for workout_type in (rng.choice(workout_types)
+                                 for _ in range(count))]
+
+
+def athlete_packages(packages: List[Record],
+                     athletes: int = ATHLETES,
+                     seed: int = SEED,
+                     ) -> List[Record]:
+    """Заменить вес, рост и бассейн пакетов значениями `athletes` людей.
+
+    Так история тренировок похожа на настоящую, где у каждого
+    спортсмена много тренировок, и `AthleteIndex` находит его в таблице.
+    """
+    rng = random.Random(seed)
+    profiles = [(rng.uniform(40, 120), rng.uniform(140, 210),
+                 rng.choice((25, 50))) for _ in range(athletes)]
+    result = []
+    for workout_type, data in packages:
+        weight, height, length_pool = rng.choice(profiles)
+        data = list(data)
+        data[2] = weight
+        if workout_type == 'WLK':
+            data[3] = height
+        elif workout_type == 'SWM':
+            data[3] = length_pool
+        result.append((workout_type, data))
+    return result
+
+
+def build_trainings(packages: List[Record]) -> List[Training]:
+    """Создать тренировки из пакетов."""
+    return [read_package(workout_type, data)
+            for workout_type, data in packages]
+
+
+def build_cached(packages: List[Record]) -> List[Training]:
+    """Создать тренировки с кэшем и один раз рассчитать показатели."""
+    trainings = [training.enable_cache()
+                 for training in build_trainings(packages)]
+    for training in trainings:
+        training.show_training_info()
+    return trainings
+
+
+def run_main(trainings: List[Training]) -> None:
+    """Вызвать `main` для каждой тренировки без вывода в консоль."""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with redirect_stdout(devnull):
+            for training in trainings:
+                main(training)
+
+
+def to_archive(packages: List[Record]) -> bytes:
+    """Записать пакеты в архив в памяти."""
+    buffer = io.BytesIO()
+    write_records(buffer, packages)
+    return buffer.getvalue()
+
+
+def read_archive(data: bytes) -> None:
+    """Прочитать все пакеты архива."""
+    with ArchiveFile(io.BytesIO(data)) as archive:
+        for _ in archive.records():
+            pass
+
+
+def archive_ratio(packages: List[Record]) -> float:
+    """Получить степень сжатия архива относительно пакетов в CSV."""
+    text = ''.join(','.join([workout_type, *map(str, data)]) + '\n'
+                   for workout_type, data in packages)
+    return len(text.encode('utf-8')) / len(to_archive(packages))
+
+
+def method_benchmark(workout_type: str, method: str) -> Benchmark:
+    """Замер одного метода расчёта для тренировок одного типа."""
+    def setup(packages: List[Record]) -> List[Callable[[], float]]:
+        return [getattr(training, method) for training in build_trainings(
+            generate_packages(len(packages), (workout_type,)))]
+
+    def run(methods: List[Callable[[], float]]) -> None:
+        for call in methods:
+            call()
+    return setup, run
+
+
+def get_benchmarks() -> Dict[str, Benchmark]:
+    """Получить замеры: подготовка данных и измеряемая часть."""
+    benchmarks: Dict[str, Benchmark] = {
+        'read_package': (lambda packages: packages, build_trainings),
+        'show_training_info': (
+            build_trainings,
+            lambda trainings: [training.show_training_info()
+                               for training in trainings]),
+        'cached_show_training_info': (
+            build_cached,
+            lambda trainings: [training.show_training_info()
+                               for training in trainings]),
+        'get_message': (
+            lambda packages: [training.show_training_info()
+                              for training in build_trainings(packages)],
+            lambda messages: [info.get_message() for info in messages]),
+        'main': (build_trainings, run_main),
+        'calculate_batch': (
+            to_columns,
+            lambda columns: calculate_batch(**columns)),
+        'validate_package': (
+            lambda packages: packages,
+            lambda packages: [validate_package(workout_type, data)
+                              for workout_type, data in packages]),
+        'validate_columns': (
+            to_columns,
+            lambda columns: validate_columns(**columns)),
+        'archive_write': (lambda packages: packages, to_archive),
+        'archive_read': (to_archive, read_archive),
+        'AthleteIndex.calculate': (
+            athlete_packages,
+            lambda packages: list(AthleteIndex().calculate_many(packages))),
+        'AthleteIndex.scalar': (
+            athlete_packages,
+            lambda packages: [
+                read_package(workout_type, data).show_training_info()
+                for workout_type, data in packages]),
+    }
+    for workout_type, training_class in TRAINING_TYPES.items():
+        for method in ('get_distance', 'get_mean_speed',
+                       'get_spent_calories'):
+            benchmarks[f'{training_class.__name__}.{method}'] = (
+                method_benchmark(workout_type, method))
+    return benchmarks
+
+
+def measure(benchmark: Benchmark,
+            packages: List[Record],
+            repeat: int = REPEAT,
+            ) -> float:
+    """Получить лучшее время из `repeat` запусков замера в секундах."""
+    setup, run = benchmark
+    state = setup(packages)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_import(module: str = 'homework', repeat: int = REPEAT) -> float:
+    """Получить лучшее время импорта модуля в новом процессе в мс."""
+    code = ('import time\n'
+            'start = time.perf_counter()\n'
+            f'import {module}\n'
+            'print((time.perf_counter() - start) * 1000)')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return min(
+        float(subprocess.run([sys.executable, '-c', code], cwd=directory,
+                             capture_output=True, text=True,
+                             check=True).stdout)
+        for _ in range(repeat))
+
+
+def run_suite(sizes: Sequence[int] = SIZES,
+              repeat: int = REPEAT,
+              names: Sequence[str] = (),
+              ) -> Dict[str, Any]:
+    """Выполнить замеры для всех размеров наборов данных."""
+    benchmarks = get_benchmarks()
+    results: Dict[str, Dict[str, float]] = {}
+    compression: Dict[str, float] = {}
+    for size in sizes:
+        packages = generate_packages(size)
+        compression[str(size)] = archive_ratio(packages)
+        for name, benchmark in benchmarks.items():
+            if names and name not in names:
+                continue
+            seconds = measure(benchmark, packages, repeat)
+            results[f'{name}[{size}]'] = {
+                'seconds': seconds,
+                'ns_per_record': seconds / size * 1e9,
+            }
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+        'compression': compression,
+        'import_ms': measure_import(repeat=repeat),
+    }
+
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    """Сохранить результаты замеров в JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Загрузить результаты замеров из JSON."""
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(baseline: Dict[str, Any],
+            current: Dict[str, Any],
+            threshold: float = THRESHOLD,
+            ) -> List[Tuple[str, float, float]]:
+    """Найти замеры, замедлившиеся больше чем на `threshold`.
+
+    Возвращает имя замера, прежнее и новое время на запись в нс.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]['ns_per_record']
+        new = result['ns_per_record']
+        if new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--only', nargs='+', default=(),
+                        help='выполнить только перечисленные замеры')
+    parser.add_argument('--output', help='файл JSON для результатов')
+    parser.add_argument('--compare', help='файл JSON прошлого запуска')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--import-budget', type=float, nargs='?', default=0,
+                        const=IMPORT_BUDGET_MS,
+                        help='наибольшее время импорта homework в мс')
+    return parser.parse_args(argv)
+
+
+def run(argv: Sequence[str]) -> int:
+    """Выполнить замеры по аргументам командной строки."""
+    args = parse_args(argv)
+    report = run_suite(args.sizes, args.repeat, args.only)
+    for name, result in report['results'].items():
+        print(f'{name}: {result["ns_per_record"]:.1f} нс на запись')
+    for size, ratio in report['compression'].items():
+        print(f'Сжатие архива [{size}]: {ratio:.2f}')
+    print(f'Импорт homework: {report["import_ms"]:.1f} мс')
+    if args.import_budget and report['import_ms'] > args.import_budget:
+        print(f'Импорт дольше бюджета {args.import_budget:.0f} мс')
+        return 1
+    if args.output:
+        save_results(report, args.output)
+    if not args.compare:
+        return 0
+    regressions = compare(load_results(args.compare), report, args.threshold)
+    for name, old, new in regressions:
+        print(f'Замедление {name}: {old:.1f} -> {new:.1f} нс на запись')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run(sys.argv[1:]))
@@ -0,0 +1,262 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from homework import TRAINING_TYPES, BatchResult, calculate_batch
+from storage import COLUMNS
+from streaming import Record
+
+MAGIC: bytes = b'WKTC'
+VERSION: int = 1
+BLOCK_SIZE: int = 65536
+FILE_HEADER = struct.Struct('<4sHH')
+BLOCK_HEADER = struct.Struct('<II')
+ALIGNMENT: int = 8
+
+
+def _padding(size: int) -> int:
+    """Получить число байт для выравнивания размера на 8."""
+    return -size % ALIGNMENT
+
+
+class ColumnBlock:
+    """Блок записей с представлениями столбцов без копирования."""
+
+    def __init__(self,
+                 codes: Sequence[str],
+                 types: memoryview,
+                 columns: Dict[str, memoryview],
+                 ) -> None:
+        self.codes: Sequence[str] = codes
+        self.types: memoryview = types
+        self.columns: Dict[str, memoryview] = columns
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def workout_types(self) -> List[str]:
+        """Получить коды тренировок записей блока."""
+        codes = self.codes
+        return [codes[index] for index in self.types]
+
+    def calculate(self) -> BatchResult:
+        """Рассчитать показатели записей блока пакетным проходом."""
+        return calculate_batch(self.workout_types(), **self.columns)
+
+    def records(self) -> Iterator[Record]:
+        """Получить пакеты тренировок блока."""
+        columns = {
+            code: [self.columns[field] for field in COLUMNS[:3]
+                   + TRAINING_TYPES[code].EXTRA_FIELDS]
+            for code in self.codes if code in TRAINING_TYPES}
+        for index, workout_type in enumerate(self.workout_types()):
+            yield workout_type, [
+                column[index] for column in columns[workout_type]]
+
+    def release(self) -> None:
+        """Освободить представления столбцов."""
+        self.types.release()
+        for view in self.columns.values():
+            view.release()
+
+
+class ColumnarWriter:
+    """Запись пакетов тренировок в двоичный столбцовый файл.
+
+    Файл начинается с заголовка и таблицы кодов тренировок, за ними
+    идут блоки до `block_size` записей: байтовый столбец номеров кодов
+    и столбцы ``float64`` с параметрами, выровненные на 8 байт.
+    Неиспользуемые типом тренировки параметры равны нулю. Тренировки
+    с параметрами не из `COLUMNS` в файл не записываются.
+    """
+
+    def __init__(self, path: str, block_size: int = BLOCK_SIZE) -> None:
+        self.codes: List[str] = [
+            code for code, training_class in list(TRAINING_TYPES.items())
+            if set(training_class.EXTRA_FIELDS) <= set(COLUMNS)]
+        if len(self.codes) > 255:
+            raise ValueError('Слишком много типов тренировок')
+        self.code_index: Dict[str, int] = {
+            code: index for index, code in enumerate(self.codes)}
+        self.block_size: int = block_size
+        self.file = open(path, 'wb')
+        self._reset()
+        self._write_header()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _reset(self) -> None:
+        self.types: array = array('B')
+        self.columns: Dict[str, array] = {
+            column: array('d') for column in COLUMNS}
+
+    def _write_header(self) -> None:
+        header = bytearray(FILE_HEADER.pack(MAGIC, VERSION, len(self.codes)))
+        for code in self.codes:
+            encoded = code.encode('utf-8')
+            header += bytes((len(encoded),)) + encoded
+        header += bytes(_padding(len(header)))
+        self.file.write(header)
+
+    def write(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить пакет тренировки."""
+        training_class = TRAINING_TYPES.get(workout_type)
+        if workout_type not in self.code_index or training_class is None:
+            if training_class is not None:
+                raise ValueError(
+                    f'Тренировку {workout_type} нельзя хранить в файле')
+            raise ValueError('Неверные данные')
+        fields = COLUMNS[:3] + training_class.EXTRA_FIELDS
+        if len(data) != len(fields):
+            raise ValueError('Неверные данные')
+        try:
+            values = dict(zip(fields, map(float, data)))
+        except (TypeError, ValueError):
+            raise ValueError('Неверные данные') from None
+        self.types.append(self.code_index[workout_type])
+        for column in COLUMNS:
+            self.columns[column].append(values.get(column, 0.0))
+        if len(self.types) >= self.block_size:
+            self.flush()
+
+    def write_many(self, records: Iterator[Record]) -> None:
+        """Добавить пакеты тренировок."""
+        for workout_type, data in records:
+            self.write(workout_type, data)
+
+    def flush(self) -> None:
+        """Записать накопленный блок в файл."""
+        count = len(self.types)
+        if not count:
+            return
+        self.file.write(BLOCK_HEADER.pack(count, 0))
+        self.file.write(self.types.tobytes() + bytes(_padding(count)))
+        for column in COLUMNS:
+            values = self.columns[column]
+            if sys.byteorder != 'little':
+                values.byteswap()
+            self.file.write(values.tobytes())
+        self._reset()
+
+    def close(self) -> None:
+        """Записать последний блок и закрыть файл."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class ColumnarFile:
+    """Чтение столбцового файла через отображение в память.
+
+    При открытии читаются только заголовки блоков; столбцы блоков
+    отдаются как `memoryview` над отображением файла без копирования.
+    На платформах с обратным порядком байт столбцы копируются.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file = open(path, 'rb')
+        self.map: Optional[mmap.mmap] = None
+        self.codes: List[str] = []
+        self.blocks: List[ColumnBlock] = []
+        try:
+            if not os.fstat(self.file.fileno()).st_size:
+                raise ValueError('Неверный формат файла тренировок')
+            self.map = mmap.mmap(self.file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+            self._read()
+        except (struct.error, IndexError, UnicodeDecodeError):
+            self.close()
+            raise ValueError('Неверный формат файла тренировок') from None
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'ColumnarFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(block) for block in self.blocks)
+
+    def _read(self) -> None:
+        view = memoryview(self.map)
+        try:
+            magic, version, code_count = FILE_HEADER.unpack_from(view)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError('Неверный формат файла тренировок')
+            offset = FILE_HEADER.size
+            for _ in range(code_count):
+                size = view[offset]
+                offset += 1 + size
+                if offset > len(view):
+                    raise ValueError('Файл тренировок обрезан')
+                self.codes.append(
+                    bytes(view[offset - size:offset]).decode('utf-8'))
+            offset += _padding(offset)
+            if offset > len(view):
+                raise ValueError('Файл тренировок обрезан')
+            while offset < len(view):
+                offset += BLOCK_HEADER.size
+                if offset > len(view):
+                    raise ValueError('Файл тренировок обрезан')
+                count, _ = BLOCK_HEADER.unpack_from(
+                    view, offset - BLOCK_HEADER.size)
+                size = count + _padding(count) + 8 * count * len(COLUMNS)
+                if offset + size > len(view):
+                    raise ValueError('Файл тренировок обрезан')
+                types = view[offset:offset + count]
+                offset += count + _padding(count)
+                columns = {}
+                for column in COLUMNS:
+                    columns[column] = self._column(
+                        view[offset:offset + 8 * count])
+                    offset += 8 * count
+                self.blocks.append(ColumnBlock(self.codes, types, columns))
+        finally:
+            view.release()
+
+    @staticmethod
+    def _column(view: memoryview) -> memoryview:
+        if sys.byteorder == 'little':
+            return view.cast('d')
+        values = array('d', view.tobytes())
+        values.byteswap()
+        return memoryview(values)
+
+    def calculate(self) -> Iterator[BatchResult]:
+        """Рассчитать показатели всех блоков по очереди."""
+        for block in self.blocks:
+            yield block.calculate()
+
+    def records(self) -> Iterator[Record]:
+        """Получить все пакеты тренировок файла."""
+        for block in self.blocks:
+            yield from block.records()
+
+    def close(self) -> None:
+        """Освободить представления столбцов и закрыть файл."""
+        for block in self.blocks:
+            block.release()
+        self.blocks = []
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+
+def write_records(path: str,
+                  records: Iterator[Record],
+                  block_size: int = BLOCK_SIZE,
+                  ) -> None:
+    """Записать пакеты тренировок в столбцовый файл."""
+    with ColumnarWriter(path, block_size) as writer:
+        writer.write_many(records)
@@ -0,0 +1,312 @@
+"""Сверка всех способов расчёта тренировок с эталонным.
+
+Запуск: ``python differential.py --count 10000 --seed 1``. Случайные
+пакеты всех зарегистрированных типов считаются эталоном (`read_package`
+и `show_training_info`) и каждым из остальных способов; поля сообщений
+сравниваются бит в бит, строки `get_message` — посимвольно. Программа
+печатает время на запись и число расхождений и завершается с кодом 1,
+если расхождения есть.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from homework import (BASE_FIELDS, TRAINING_TYPES, InfoMessage,
+                      calculate_batch, iter_batch_messages, read_package)
+from streaming import Record, to_columns
+
+SEED: int = 2021
+COUNT: int = 1000
+MAX_EXAMPLES: int = 5
+FIELD_RANGES: Dict[str, Tuple[float, float]] = {
+    'action': (0, 50000),
+    'duration': (0.01, 10),
+    'weight': (0, 200),
+    'height': (0.5, 250),
+    'length_pool': (1, 100),
+    'count_pool': (0, 200),
+}
+DEFAULT_RANGE: Tuple[float, float] = (0.1, 100)
+SPECIAL_VALUES: Tuple[float, ...] = (0, 0.0, -0.0, 1, 0.5)
+
+Engine = Callable[[List[Record]], List[InfoMessage]]
+
+
+def generate_records(count: int,
+                     seed: int = SEED,
+                     workout_types: Sequence[str] = (),
+                     ) -> List[Record]:
+    """Сгенерировать случайные корректные пакеты всех типов тренировок.
+
+    Параметры бывают целыми и дробными, иногда нулевыми (в том числе
+    -0.0) или маленькими, чтобы задеть целочисленное деление и
+    округление при выводе. Делители тренировки не бывают нулевыми.
+    """
+    rng = random.Random(seed)
+    workout_types = list(workout_types or TRAINING_TYPES)
+    records = []
+    for _ in range(count):
+        workout_type = rng.choice(workout_types)
+        training_class = TRAINING_TYPES[workout_type]
+        data = []
+        for field in BASE_FIELDS + training_class.EXTRA_FIELDS:
+            low, high = FIELD_RANGES.get(field, DEFAULT_RANGE)
+            chance = rng.random()
+            if chance < 0.05:
+                value = rng.choice(SPECIAL_VALUES)
+            elif chance < 0.5:
+                value = rng.randint(int(low), int(high))
+            else:
+                value = rng.uniform(low, high)
+            if field in training_class.NONZERO_FIELDS and not value:
+                value = high
+            data.append(value)
+        records.append((workout_type, data))
+    return records
+
+
+def scalar(records: List[Record]) -> List[InfoMessage]:
+    """Эталон: объект тренировки на каждый пакет."""
+    return [read_package(workout_type, data).show_training_info()
+            for workout_type, data in records]
+
+
+def batch(records: List[Record]) -> List[InfoMessage]:
+    """Пакетный расчёт по столбцам."""
+    columns = to_columns(records)
+    return list(iter_batch_messages(columns['workout_types'],
+                                    columns['duration'],
+                                    calculate_batch(**columns)))
+
+
+def threaded(records: List[Record]) -> List[InfoMessage]:
+    """Пакетный расчёт по частям в пуле потоков."""
+    from parallel import calculate_batch_threaded
+    columns = to_columns(records)
+    result = calculate_batch_threaded(chunk_size=max(1, len(records) // 4),
+                                      **columns)
+    return list(iter_batch_messages(columns['workout_types'],
+                                    columns['duration'], result))
+
+
+def streaming(records: List[Record]) -> List[InfoMessage]:
+    """Потоковый расчёт через генераторы."""
+    from streaming import iter_messages, iter_trainings
+    return list(iter_messages(iter_trainings(records)))
+
+
+def processes(records: List[Record]) -> List[InfoMessage]:
+    """Расчёт частями в пуле процессов."""
+    from parallel import process_parallel
+    return list(process_parallel(records, workers=2,
+                                 chunk_size=max(1, len(records) // 4)))
+
+
+def cached(records: List[Record]) -> List[InfoMessage]:
+    """Тренировки с кэшем показателей; каждая считается дважды."""
+    trainings = [read_package(workout_type, data).enable_cache()
+                 for workout_type, data in records]
+    for training in trainings:
+        training.show_training_info()
+    return [training.show_training_info() for training in trainings]
+
+
+def result_cache(records: List[Record]) -> List[InfoMessage]:
+    """Кэш сообщений по содержимому пакета; каждый пакет дважды."""
+    from result_cache import ResultCache
+    with ResultCache() as cache:
+        for workout_type, data in records:
+            cache.get_info(workout_type, data)
+        return [cache.get_info(workout_type, data)
+                for workout_type, data in records]
+
+
+def table(records: List[Record]) -> List[InfoMessage]:
+    """Столбцовая таблица с лёгкими представлениями записей."""
+    from storage import WorkoutTable
+    return [view.show_training_info() for view in WorkoutTable(records)]
+
+
+def columnar(records: List[Record]) -> List[InfoMessage]:
+    """Двоичный столбцовый файл и расчёт по его блокам."""
+    from columnar import ColumnarFile, write_records
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'records.wktc')
+        write_records(path, iter(records), block_size=256)
+        messages = []
+        with ColumnarFile(path) as file:
+            for block, result in zip(file.blocks, file.calculate()):
+                messages.extend(iter_batch_messages(
+                    block.workout_types(), block.columns['duration'],
+                    result))
+        return messages
+
+
+def archive(records: List[Record]) -> List[InfoMessage]:
+    """Сжатый архив; сообщения возвращаются в порядке исходных пакетов."""
+    from archive import ArchiveFile, write_records
+    buffer = io.BytesIO()
+    write_records(buffer, records, block_size=max(1, len(records)))
+    codes = list(TRAINING_TYPES)
+    order = sorted(range(len(records)),
+                   key=lambda index: codes.index(records[index][0]))
+    messages: List[Optional[InfoMessage]] = [None] * len(records)
+    with ArchiveFile(buffer) as file:
+        for index, info in zip(order, file.messages()):
+            messages[index] = info
+    return messages
+
+
+def profiles(records: List[Record]) -> List[InfoMessage]:
+    """Таблица множителей по спортсменам."""
+    from profiles import AthleteIndex
+    return list(AthleteIndex().calculate_many(records))
+
+
+def server(records: List[Record]) -> List[InfoMessage]:
+    """Ответы сервера в JSON; строка сообщения сверяется отдельно."""
+    from server import process_line
+    messages = []
+    for workout_type, data in records:
+        response = json.loads(process_line(
+            json.dumps([workout_type, data]).encode('utf-8')))
+        message = response.pop('message')
+        info = InfoMessage(**response)
+        if info.get_message() != message:
+            info.training_type += ' (другая строка сообщения)'
+        messages.append(info)
+    return messages
+
+
+ENGINES: Dict[str, Engine] = {
+    'batch': batch,
+    'threaded': threaded,
+    'streaming': streaming,
+    'parallel': processes,
+    'cached': cached,
+    'result_cache': result_cache,
+    'table': table,
+    'columnar': columnar,
+    'archive': archive,
+    'profiles': profiles,
+    'server': server,
+}
+
+
+def fingerprint(info: InfoMessage) -> Tuple[str, ...]:
+    """Получить поля сообщения в виде, различающем 0.0 и -0.0.
+
+    Числа сравниваются как ``float64``: целая длительность из пакета
+    и та же длительность из столбцового хранилища считаются равными.
+    """
+    return (info.training_type,
+            *(float(getattr(info, name)).hex()
+              for name in info.__slots__[1:]),
+            info.get_message())
+
+
+def find_mismatches(records: List[Record],
+                    expected: List[InfoMessage],
+                    result: List[InfoMessage],
+                    ) -> List[Dict[str, Any]]:
+    """Найти записи, на которых результат отличается от эталона."""
+    mismatches = []
+    if len(result) != len(expected):
+        mismatches.append({'index': None,
+                           'error': f'{len(result)} сообщений '
+                                    f'вместо {len(expected)}'})
+    for index, (record, reference, info) in enumerate(
+            zip(records, expected, result)):
+        if info is None or fingerprint(info) != fingerprint(reference):
+            mismatches.append({
+                'index': index,
+                'record': record,
+                'expected': fingerprint(reference),
+                'actual': fingerprint(info) if info is not None else None,
+            })
+    return mismatches
+
+
+def measure(engine: Engine,
+            records: List[Record],
+            ) -> Tuple[float, Optional[List[InfoMessage]], Optional[str]]:
+    """Выполнить расчёт; вернуть время, сообщения и текст ошибки."""
+    start = time.perf_counter()
+    try:
+        result = engine(records)
+    except Exception as error:
+        return time.perf_counter() - start, None, repr(error)
+    return time.perf_counter() - start, result, None
+
+
+def run_harness(count: int = COUNT,
+                seed: int = SEED,
+                engines: Sequence[str] = (),
+                ) -> Dict[str, Any]:
+    """Сверить способы расчёта с эталоном на случайных пакетах."""
+    records = generate_records(count, seed)
+    seconds, expected, error = measure(scalar, records)
+    if expected is None:
+        raise RuntimeError(f'Эталонный расчёт завершился ошибкой: {error}')
+    report: Dict[str, Any] = {
+        'count': count,
+        'seed': seed,
+        'engines': {'scalar': {'seconds': seconds,
+                               'ns_per_record': seconds / count * 1e9,
+                               'mismatches': 0, 'examples': []}},
+    }
+    for name, engine in ENGINES.items():
+        if engines and name not in engines:
+            continue
+        seconds, result, error = measure(engine, records)
+        if result is None:
+            mismatches = [{'index': None, 'error': error}]
+        else:
+            mismatches = find_mismatches(records, expected, result)
+        report['engines'][name] = {
+            'seconds': seconds,
+            'ns_per_record': seconds / count * 1e9,
+            'mismatches': len(mismatches),
+            'examples': mismatches[:MAX_EXAMPLES],
+        }
+    return report
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=COUNT)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--engines', nargs='+', default=(),
+                        choices=sorted(ENGINES),
+                        help='сверить только перечисленные способы')
+    parser.add_argument('--output', help='файл JSON для отчёта')
+    return parser.parse_args(argv)
+
+
+def run(argv: Sequence[str]) -> int:
+    """Выполнить сверку по аргументам командной строки."""
+    args = parse_args(argv)
+    report = run_harness(args.count, args.seed, args.engines)
+    failed = False
+    for name, result in report['engines'].items():
+        print(f'{name}: {result["ns_per_record"]:.1f} нс на запись, '
+              f'расхождений: {result["mismatches"]}')
+        for example in result['examples']:
+            print(f'  {example}')
+        failed = failed or bool(result['mismatches'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2,
+                      default=repr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run(sys.argv[1:]))
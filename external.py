@@ -0,0 +1,201 @@
+import heapq
+import pickle
+import tempfile
+from itertools import groupby, islice
+from typing import (IO, Any, Callable, Dict, Hashable, Iterable, Iterator,
+                    List, Optional, Sequence, Tuple)
+
+from aggregation import Stats
+from homework import BatchResult, iter_batch_rows
+
+MAX_ROWS: int = 100_000
+FAN_IN: int = 64
+FIELDS: Tuple[str, ...] = (
+    'training_type', 'duration', 'distance', 'speed', 'calories')
+
+Row = Tuple[Any, ...]
+Key = Optional[Callable[[Row], Any]]
+
+
+def batch_rows(workout_types: Sequence[str],
+               duration: Sequence[float],
+               result: BatchResult,
+               ) -> Iterator[Row]:
+    """Получить строки результатов пакетного расчёта без `InfoMessage`."""
+    return iter_batch_rows(workout_types, duration, result)
+
+
+def _block_rows(max_rows: int, fan_in: int) -> int:
+    """Получить размер блока серии для слияния в пределах `max_rows`."""
+    return max(1, max_rows // fan_in)
+
+
+def _write_run(items: Iterable[Any],
+               tmpdir: Optional[str],
+               block_rows: int,
+               ) -> IO[bytes]:
+    """Записать отсортированную серию во временный файл блоками."""
+    run = tempfile.TemporaryFile(dir=tmpdir)
+    items = iter(items)
+    while True:
+        block = list(islice(items, block_rows))
+        if not block:
+            break
+        pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _read_run(run: IO[bytes]) -> Iterator[Any]:
+    """Прочитать серию блоками и закрыть файл."""
+    with run:
+        while True:
+            try:
+                block = pickle.load(run)
+            except EOFError:
+                return
+            yield from block
+
+
+def _merge_runs(runs: List[IO[bytes]],
+                key: Key,
+                reverse: bool,
+                fan_in: int,
+                tmpdir: Optional[str],
+                block_rows: int,
+                combine: Callable[[Iterator[Any]], Iterator[Any]] = iter,
+                ) -> Iterator[Any]:
+    """Слить серии, при необходимости в несколько проходов по `fan_in`.
+
+    При слиянии в памяти держится по одному блоку каждой серии.
+    """
+    def merge(group: List[IO[bytes]]) -> Iterator[Any]:
+        return combine(heapq.merge(*map(_read_run, group), key=key,
+                                   reverse=reverse))
+
+    while len(runs) > fan_in:
+        runs = [_write_run(merge(runs[i:i + fan_in]), tmpdir, block_rows)
+                for i in range(0, len(runs), fan_in)]
+    return merge(runs)
+
+
+class ExternalSorter:
+    """Сортировка потока строк с ограниченной памятью.
+
+    Серии по `max_rows` строк сортируются в памяти, сбрасываются
+    во временные файлы блоками по ``max_rows // fan_in`` строк
+    и сливаются по `fan_in` штук за проход, поэтому и при слиянии
+    в памяти держится около `max_rows` строк. Сортировка устойчивая,
+    как `sorted`.
+    """
+
+    def __init__(self,
+                 key: Key = None,
+                 reverse: bool = False,
+                 max_rows: int = MAX_ROWS,
+                 fan_in: int = FAN_IN,
+                 tmpdir: Optional[str] = None,
+                 ) -> None:
+        if max_rows < 1 or fan_in < 2:
+            raise ValueError('Неверные ограничения памяти')
+        self.key: Key = key
+        self.reverse: bool = reverse
+        self.max_rows: int = max_rows
+        self.fan_in: int = fan_in
+        self.tmpdir: Optional[str] = tmpdir
+        self.block_rows: int = _block_rows(max_rows, fan_in)
+        self.runs: int = 0
+
+    def sort(self, rows: Iterable[Row]) -> Iterator[Row]:
+        """Получить строки в порядке сортировки."""
+        rows = iter(rows)
+        runs: List[IO[bytes]] = []
+        while True:
+            chunk = list(islice(rows, self.max_rows))
+            chunk.sort(key=self.key, reverse=self.reverse)
+            if not runs and len(chunk) < self.max_rows:
+                return iter(chunk)
+            if not chunk:
+                break
+            runs.append(_write_run(chunk, self.tmpdir, self.block_rows))
+            self.runs += 1
+        return _merge_runs(runs, self.key, self.reverse, self.fan_in,
+                           self.tmpdir, self.block_rows)
+
+
+def external_sort(rows: Iterable[Row],
+                  key: Key = None,
+                  reverse: bool = False,
+                  max_rows: int = MAX_ROWS,
+                  tmpdir: Optional[str] = None,
+                  ) -> Iterator[Row]:
+    """Отсортировать поток строк, сбрасывая серии на диск."""
+    return ExternalSorter(key, reverse, max_rows,
+                          tmpdir=tmpdir).sort(rows)
+
+
+def group_by(rows: Iterable[Row],
+             key: Callable[[Row], Hashable],
+             value: Callable[[Row], float],
+             max_rows: int = MAX_ROWS,
+             fan_in: int = FAN_IN,
+             tmpdir: Optional[str] = None,
+             ) -> Iterator[Tuple[Hashable, Stats]]:
+    """Получить статистику значения по группам в порядке ключей.
+
+    В памяти копится не больше `max_rows` групп; при переполнении
+    частичные итоги сбрасываются на диск отсортированной серией,
+    а в конце серии сливаются с объединением одинаковых ключей.
+    Ключи групп должны быть сравнимы между собой.
+    """
+    if max_rows < 1 or fan_in < 2:
+        raise ValueError('Неверные ограничения памяти')
+    block_rows = _block_rows(max_rows, fan_in)
+    groups: Dict[Hashable, Stats] = {}
+    runs: List[IO[bytes]] = []
+    for row in rows:
+        group = key(row)
+        stats = groups.get(group)
+        if stats is None:
+            if len(groups) >= max_rows:
+                runs.append(_write_run(sorted(groups.items(),
+                                              key=_group_key),
+                                       tmpdir, block_rows))
+                groups = {}
+            stats = groups[group] = Stats()
+        stats.add(value(row))
+    items = sorted(groups.items(), key=_group_key)
+    if not runs:
+        yield from items
+        return
+    runs.append(_write_run(items, tmpdir, block_rows))
+    yield from _merge_runs(runs, _group_key, False, fan_in, tmpdir,
+                           block_rows, _combine)
+
+
+def _group_key(item: Tuple[Hashable, Stats]) -> Any:
+    return item[0]
+
+
+def _combine(items: Iterable[Tuple[Hashable, Stats]],
+             ) -> Iterator[Tuple[Hashable, Stats]]:
+    """Объединить частичные итоги соседних одинаковых ключей."""
+    for group, parts in groupby(items, key=_group_key):
+        _, stats = next(parts)
+        for _, other in parts:
+            stats.merge(other)
+        yield group, stats
+
+
+def top_k(rows: Iterable[Row],
+          k: int,
+          key: Key = None,
+          smallest: bool = False,
+          ) -> List[Row]:
+    """Получить `k` строк с наибольшим (или наименьшим) ключом.
+
+    Память — `k` строк независимо от длины потока.
+    """
+    if smallest:
+        return heapq.nsmallest(k, rows, key=key)
+    return heapq.nlargest(k, rows, key=key)
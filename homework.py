@@ -1,18 +1,63 @@
-from dataclasses import asdict, dataclass
-from typing import Dict, Type
+import io
+import math
+import sys
+import threading
+import weakref
+from array import array
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import starmap
+from operator import attrgetter
+from string import Formatter
+from typing import (IO, TYPE_CHECKING, Callable, ClassVar, Dict, Iterable,
+                    Iterator, List, Optional, Sequence, Tuple, Type)
+
+if TYPE_CHECKING:
+    from sinks import Sink
+
+BatchMetrics = Tuple[List[float], List[float], List[float]]
+MetricsCacheInfo = namedtuple('MetricsCacheInfo', ('hits', 'misses'))
+RENDER_BUFFER_SIZE: int = 1024
+RENDER_CACHE_SIZE: int = 65536
+
+
+@lru_cache(maxsize=None)
+def compile_template(template: str) -> Tuple[Callable[..., str],
+                                             Callable[..., tuple]]:
+    """Подготовить шаблон с именованными полями к быстрой подстановке.
+
+    Возвращает позиционный `str.format` и функцию, достающую значения
+    полей из объекта в нужном порядке.
+    """
+    parts: List[str] = []
+    names: List[str] = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if name is not None:
+            names.append(name)
+            parts.append('{' + (f'!{conversion}' if conversion else '')
+                         + (f':{spec}' if spec else '') + '}')
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        return ''.join(parts).format, lambda obj: (getter(obj),)
+    return ''.join(parts).format, getter
 
 
 @dataclass
 class InfoMessage:
     """Информационное сообщение о тренировке."""
 
+    __slots__ = ('training_type', 'duration', 'distance', 'speed',
+                 'calories')
+
     training_type: str
     duration: float
     distance: float
     speed: float
     calories: float
 
-    STR_RETURN: str = (
+    STR_RETURN: ClassVar[str] = (
         'Тип тренировки: {training_type}; '
         'Длительность: {duration:.3f} ч.; '
         'Дистанция: {distance:.3f} км; '
@@ -21,15 +66,67 @@ class InfoMessage:
 
     def get_message(self) -> str:
         """Получить строку по тренировкам"""
-        return self.STR_RETURN.format(**asdict(self))
+        render, fields = compile_template(self.STR_RETURN)
+        return render(*fields(self))
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_fields(template: str, *values: object) -> str:
+    """Получить строку сообщения по значениям полей с кэшированием."""
+    return compile_template(template)[0](*values)
+
+
+def render_many(messages: Iterable[InfoMessage],
+                out: IO,
+                cache: bool = False,
+                buffer_size: int = RENDER_BUFFER_SIZE,
+                ) -> int:
+    """Записать строки сообщений в текстовый или двоичный поток.
+
+    Строки собираются в блоки по `buffer_size` и записываются одним
+    вызовом `write`; двоичный поток получает текст в UTF-8. С `cache`
+    повторяющиеся сообщения берутся из кэша готовых строк.
+    Возвращает число записанных сообщений.
+    """
+    binary = isinstance(out, (io.RawIOBase, io.BufferedIOBase))
+    count = 0
+    lines: List[str] = []
+    for info in messages:
+        render, fields = compile_template(info.STR_RETURN)
+        values = fields(info)
+        # Ключи кэша равны для 0.0 и -0.0, а строки у них разные.
+        if cache and 0 not in values:
+            lines.append(render_fields(info.STR_RETURN, *values))
+        else:
+            lines.append(render(*values))
+        if len(lines) >= buffer_size:
+            count += _write_lines(out, lines, binary)
+            lines = []
+    if lines:
+        count += _write_lines(out, lines, binary)
+    return count
+
+
+def _write_lines(out: IO, lines: List[str], binary: bool) -> int:
+    """Записать блок строк в поток одним вызовом."""
+    text = '\n'.join(lines) + '\n'
+    out.write(text.encode('utf-8') if binary else text)
+    return len(lines)
 
 
 class Training:
     """Базовый класс тренировки."""
 
+    # `__dict__` оставлен в слотах, чтобы у объекта можно было подменить
+    # атрибут; сам словарь создаётся только при первой такой подмене.
+    __slots__ = ('action', 'duration', 'weight', '__dict__')
+
     LEN_STEP: float = 0.65
     M_IN_KM: float = 1000
     MIN_IN_HOUR: float = 60
+    EXTRA_FIELDS: Tuple[str, ...] = ()
+    NONZERO_FIELDS: Tuple[str, ...] = ('duration',)
+    ATHLETE_FIELDS: Tuple[str, ...] = ('weight',)
 
     def __init__(self,
                  action: float,
@@ -40,6 +137,50 @@ class Training:
         self.duration: float = duration
         self.weight: float = weight
 
+    @classmethod
+    def get_batch_metrics(cls,
+                          action: Sequence[float],
+                          duration: Sequence[float],
+                          weight: Sequence[float],
+                          *extra: Sequence[float],
+                          ) -> BatchMetrics:
+        """Получить дистанцию, скорость и калории для столбцов данных.
+
+        Базовая реализация создаёт объект на каждую запись; наследники,
+        меняющие формулы, переопределяют метод построчным проходом.
+        """
+        rows = zip(action, duration, weight, *extra)
+        trainings = [cls(*row) for row in rows]
+        return ([training.get_distance() for training in trainings],
+                [training.get_mean_speed() for training in trainings],
+                [training.get_spent_calories() for training in trainings])
+
+    @classmethod
+    def get_athlete_factors(cls, *athlete: float) -> Tuple[float, ...]:
+        """Получить множители формул, зависящие только от спортсмена.
+
+        Параметры спортсмена — значения `ATHLETE_FIELDS`; они должны
+        идти в конструкторе сразу после ``duration``. Базовая реализация
+        ничего не вычисляет заранее.
+        """
+        return athlete
+
+    @classmethod
+    def get_profiled_metrics(cls,
+                             factors: Tuple[float, ...],
+                             action: float,
+                             duration: float,
+                             *session: float,
+                             ) -> Tuple[float, float, float]:
+        """Получить дистанцию, скорость и калории по множителям спортсмена.
+
+        Наследники, переопределяющие `get_athlete_factors`, должны
+        переопределить и этот метод.
+        """
+        training = cls(action, duration, *factors, *session)
+        return (training.get_distance(), training.get_mean_speed(),
+                training.get_spent_calories())
+
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
         return self.action * self.LEN_STEP / self.M_IN_KM
@@ -61,10 +202,75 @@ class Training:
             self.get_mean_speed(),
             self.get_spent_calories())
 
-
+    def enable_cache(self) -> 'Training':
+        """Включить кэширование рассчитанных показателей тренировки.
+
+        Каждый показатель считается один раз; изменение любого атрибута
+        объекта сбрасывает кэш. Изменения констант класса кэш не
+        отслеживает.
+        """
+        self.__class__ = _get_cached_class(self.__class__)
+        return self
+
+    def disable_cache(self) -> 'Training':
+        """Выключить кэширование показателей тренировки."""
+        if '_CACHED_VARIANT' in type(self).__dict__:
+            self.__class__ = self.__class__.__base__
+            self.__dict__.pop('_metrics', None)
+        return self
+
+
+TRAINING_TYPES: Dict[str, Type[Training]] = {}
+TRAINING_ARITY: Dict[str, int] = {}
+_DISPATCH: Dict[str, Tuple[Type[Training], int]] = {}
+# Чтение реестров идёт без блокировки: запись в словарь атомарна,
+# а `_DISPATCH` хранит класс и число параметров одним кортежем.
+# Блокировка нужна только изменяющим реестр.
+_REGISTRY_LOCK = threading.Lock()
+BASE_FIELDS: Tuple[str, ...] = ('action', 'duration', 'weight')
+
+
+def register_training(code: str,
+                      ) -> Callable[[Type[Training]], Type[Training]]:
+    """Зарегистрировать класс тренировки под кодом пакета.
+
+    Используется как декоратор класса. Параметры конструктора должны
+    совпадать с ``BASE_FIELDS + EXTRA_FIELDS``; их число сохраняется
+    для проверки пакетов.
+    """
+    def register(training_class: Type[Training]) -> Type[Training]:
+        if not issubclass(training_class, Training):
+            raise TypeError(f'{training_class} не является тренировкой')
+        init = training_class.__init__.__code__
+        fields = init.co_varnames[1:init.co_argcount]
+        if fields != BASE_FIELDS + training_class.EXTRA_FIELDS:
+            raise TypeError(
+                f'Параметры {training_class.__name__} не совпадают '
+                'с BASE_FIELDS и EXTRA_FIELDS')
+        with _REGISTRY_LOCK:
+            if code in TRAINING_TYPES:
+                raise ValueError(f'Код тренировки {code} уже занят')
+            TRAINING_TYPES[code] = training_class
+            TRAINING_ARITY[code] = len(fields)
+            _DISPATCH[code] = (training_class, len(fields))
+        return training_class
+    return register
+
+
+def unregister_training(code: str) -> Type[Training]:
+    """Удалить класс тренировки из реестра и вернуть его."""
+    with _REGISTRY_LOCK:
+        del _DISPATCH[code]
+        del TRAINING_ARITY[code]
+        return TRAINING_TYPES.pop(code)
+
+
+@register_training('RUN')
 class Running(Training):
     """Тренировка: бег."""
 
+    __slots__ = ()
+
     COEFF_RUN_1: float = 18
     COEFF_RUN_2: float = 20
 
@@ -74,12 +280,50 @@ class Running(Training):
                 * self.weight / self.M_IN_KM
                 * self.duration * self.MIN_IN_HOUR)
 
-
+    @classmethod
+    def get_batch_metrics(cls,
+                          action: Sequence[float],
+                          duration: Sequence[float],
+                          weight: Sequence[float],
+                          *extra: Sequence[float],
+                          ) -> BatchMetrics:
+        """Получить дистанцию, скорость и калории для столбцов данных."""
+        len_step, m_in_km, min_in_hour = (
+            cls.LEN_STEP, cls.M_IN_KM, cls.MIN_IN_HOUR)
+        coeff_1, coeff_2 = cls.COEFF_RUN_1, cls.COEFF_RUN_2
+        distance = [a * len_step / m_in_km for a in action]
+        speed = [d / t for d, t in zip(distance, duration)]
+        calories = [(coeff_1 * v - coeff_2) * w / m_in_km * t * min_in_hour
+                    for v, t, w in zip(speed, duration, weight)]
+        return distance, speed, calories
+
+    @classmethod
+    def get_profiled_metrics(cls,
+                             factors: Tuple[float, ...],
+                             action: float,
+                             duration: float,
+                             *session: float,
+                             ) -> Tuple[float, float, float]:
+        """Получить дистанцию, скорость и калории по множителям спортсмена."""
+        weight, = factors
+        distance = action * cls.LEN_STEP / cls.M_IN_KM
+        speed = distance / duration
+        return distance, speed, (
+            (cls.COEFF_RUN_1 * speed - cls.COEFF_RUN_2) * weight
+            / cls.M_IN_KM * duration * cls.MIN_IN_HOUR)
+
+
+@register_training('WLK')
 class SportsWalking(Training):
     """Тренировка: спортивная ходьба."""
 
+    __slots__ = ('height',)
+
     COEFF_WLK_1: float = 0.035
     COEFF_WLK_2: float = 0.029
+    EXTRA_FIELDS: Tuple[str, ...] = ('height',)
+    NONZERO_FIELDS: Tuple[str, ...] = ('duration', 'height')
+    ATHLETE_FIELDS: Tuple[str, ...] = ('weight', 'height')
 
     def __init__(self,
                  action: float,
@@ -97,13 +341,58 @@ class SportsWalking(Training):
                 * self.COEFF_WLK_2 * self.weight)
                 * self.duration * self.MIN_IN_HOUR)
 
-
+    @classmethod
+    def get_batch_metrics(cls,
+                          action: Sequence[float],
+                          duration: Sequence[float],
+                          weight: Sequence[float],
+                          *extra: Sequence[float],
+                          ) -> BatchMetrics:
+        """Получить дистанцию, скорость и калории для столбцов данных."""
+        height, = extra
+        len_step, m_in_km, min_in_hour = (
+            cls.LEN_STEP, cls.M_IN_KM, cls.MIN_IN_HOUR)
+        coeff_1, coeff_2 = cls.COEFF_WLK_1, cls.COEFF_WLK_2
+        distance = [a * len_step / m_in_km for a in action]
+        speed = [d / t for d, t in zip(distance, duration)]
+        calories = [(coeff_1 * w + (v ** 2 // h) * coeff_2 * w)
+                    * t * min_in_hour
+                    for v, t, w, h in zip(speed, duration, weight, height)]
+        return distance, speed, calories
+
+    @classmethod
+    def get_athlete_factors(cls, *athlete: float) -> Tuple[float, ...]:
+        """Получить вес, рост и первое слагаемое калорий в минуту."""
+        weight, height = athlete
+        return weight, height, cls.COEFF_WLK_1 * weight
+
+    @classmethod
+    def get_profiled_metrics(cls,
+                             factors: Tuple[float, ...],
+                             action: float,
+                             duration: float,
+                             *session: float,
+                             ) -> Tuple[float, float, float]:
+        """Получить дистанцию, скорость и калории по множителям спортсмена."""
+        weight, height, base = factors
+        distance = action * cls.LEN_STEP / cls.M_IN_KM
+        speed = distance / duration
+        return distance, speed, (
+            (base + (speed ** 2 // height) * cls.COEFF_WLK_2 * weight)
+            * duration * cls.MIN_IN_HOUR)
+
+
+@register_training('SWM')
 class Swimming(Training):
     """Тренировка: плавание."""
 
+    __slots__ = ('length_pool', 'count_pool')
+
     LEN_STEP: float = 1.38
     COEFF_SWM_1: float = 1.1
     COEFF_SWM_2: float = 2
+    EXTRA_FIELDS: Tuple[str, ...] = ('length_pool', 'count_pool')
+    ATHLETE_FIELDS: Tuple[str, ...] = ('weight', 'length_pool')
 
     def __init__(self,
                  action: float,
@@ -126,34 +415,457 @@ class Swimming(Training):
         return ((self.get_mean_speed() + self.COEFF_SWM_1)
                 * self.COEFF_SWM_2 * self.weight)
 
-
-def read_package(workout_type: str, data: list) -> Training:
-    """Прочитать данные полученные от датчиков."""
-    dict_training: Dict[str, Type[Training]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking,
+    @classmethod
+    def get_batch_metrics(cls,
+                          action: Sequence[float],
+                          duration: Sequence[float],
+                          weight: Sequence[float],
+                          *extra: Sequence[float],
+                          ) -> BatchMetrics:
+        """Получить дистанцию, скорость и калории для столбцов данных."""
+        length_pool, count_pool = extra
+        len_step, m_in_km = cls.LEN_STEP, cls.M_IN_KM
+        coeff_1, coeff_2 = cls.COEFF_SWM_1, cls.COEFF_SWM_2
+        distance = [a * len_step / m_in_km for a in action]
+        speed = [lp * cp / m_in_km / t
+                 for lp, cp, t in zip(length_pool, count_pool, duration)]
+        calories = [(v + coeff_1) * coeff_2 * w
+                    for v, w in zip(speed, weight)]
+        return distance, speed, calories
+
+    @classmethod
+    def get_athlete_factors(cls, *athlete: float) -> Tuple[float, ...]:
+        """Получить вес, длину бассейна и множитель калорий.
+
+        ``(v + k1) * k2 * w`` равно ``(v + k1) * (k2 * w)`` бит в бит,
+        только если `COEFF_SWM_2` — степень двойки; иначе множитель
+        не вычисляется заранее.
+        """
+        weight, length_pool = athlete
+        mantissa, _ = math.frexp(cls.COEFF_SWM_2)
+        scale = cls.COEFF_SWM_2 * weight if mantissa == 0.5 else None
+        return weight, length_pool, scale
+
+    @classmethod
+    def get_profiled_metrics(cls,
+                             factors: Tuple[float, ...],
+                             action: float,
+                             duration: float,
+                             *session: float,
+                             ) -> Tuple[float, float, float]:
+        """Получить дистанцию, скорость и калории по множителям спортсмена."""
+        weight, length_pool, scale = factors
+        count_pool, = session
+        distance = action * cls.LEN_STEP / cls.M_IN_KM
+        speed = length_pool * count_pool / cls.M_IN_KM / duration
+        if scale is None:
+            return distance, speed, (
+                (speed + cls.COEFF_SWM_1) * cls.COEFF_SWM_2 * weight)
+        return distance, speed, (speed + cls.COEFF_SWM_1) * scale
+
+
+CACHED_METRICS: Tuple[str, ...] = (
+    'get_distance', 'get_mean_speed', 'get_spent_calories')
+_CACHED_CLASSES: Dict[Type[Training], Type[Training]] = {}
+# Счётчики кэша ведутся, только если включены `metrics_cache_counting`:
+# отдельно в каждом потоке, а суммируются при чтении, поэтому попадания
+# не берут общую блокировку.
+_COUNT_STATS: bool = False
+_STATS_COUNTS: Dict[int, List[int]] = {}
+_STATS_TOTAL: List[int] = [0, 0]
+_STATS_LOCK = threading.Lock()
+HITS, MISSES = 0, 1
+
+
+class _CountsOwner:
+    """Объект, который живёт, пока жив поток со счётчиками."""
+
+    __slots__ = ('__weakref__',)
+
+
+def _fold_counts(counts: List[int]) -> None:
+    """Перенести счётчики завершённого потока в общий итог."""
+    with _STATS_LOCK:
+        _STATS_TOTAL[HITS] += counts[HITS]
+        _STATS_TOTAL[MISSES] += counts[MISSES]
+        del _STATS_COUNTS[id(counts)]
+
+
+class _ThreadCacheCounts(threading.local):
+    """Счётчики попаданий и промахов кэша показателей одного потока.
+
+    Когда поток завершается, его данные удаляются, и счётчики
+    переносятся в общий итог.
+    """
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0, 0]
+        self.owner: _CountsOwner = _CountsOwner()
+        with _STATS_LOCK:
+            _STATS_COUNTS[id(self.counts)] = self.counts
+        weakref.finalize(self.owner, _fold_counts, self.counts)
+
+
+_THREAD_COUNTS = _ThreadCacheCounts()
+
+
+def _memoize_metric(name: str,
+                    training_class: Type[Training],
+                    ) -> Callable[[Training], float]:
+    """Обернуть метод расчёта показателя кэшем объекта.
+
+    Метод класса ищется при каждом промахе, поэтому подмена методов
+    класса (например, замерами) действует и на кэширующий вариант.
+    """
+    def cached(self: Training) -> float:
+        try:
+            value = self._metrics[name]
+        except AttributeError:
+            metrics = self.__dict__['_metrics'] = {}
+        except KeyError:
+            metrics = self._metrics
+        else:
+            if _COUNT_STATS:
+                _THREAD_COUNTS.counts[HITS] += 1
+            return value
+        if _COUNT_STATS:
+            _THREAD_COUNTS.counts[MISSES] += 1
+        metrics[name] = value = getattr(training_class, name)(self)
+        return value
+    cached.__name__ = name
+    cached.__doc__ = getattr(training_class, name).__doc__
+    return cached
+
+
+def _invalidating_setattr(self: Training, name: str, value: object) -> None:
+    """Изменить атрибут тренировки и сбросить кэш показателей."""
+    object.__setattr__(self, name, value)
+    self.__dict__.pop('_metrics', None)
+
+
+def _reduce_cached(self: Training) -> Tuple[Callable, tuple]:
+    """Сохранить тренировку с кэшем как объект базового класса.
+
+    Вариант с кэшем нельзя найти по имени модуля, поэтому при
+    восстановлении создаётся объект базового класса и кэш включается
+    заново. Рассчитанные показатели не сохраняются.
+    """
+    base = type(self).__base__
+    fields = {
+        name: getattr(self, name)
+        for klass in base.__mro__
+        for name in klass.__dict__.get('__slots__', ())
+        if name != '__dict__' and hasattr(self, name)
     }
+    fields.update((name, value) for name, value in self.__dict__.items()
+                  if name != '_metrics')
+    return _restore_cached, (base, fields)
+
+
+def _restore_cached(training_class: Type[Training],
+                    fields: Dict[str, object],
+                    ) -> Training:
+    """Восстановить тренировку с кэшем из полей базового класса."""
+    training = training_class.__new__(training_class)
+    for name, value in fields.items():
+        object.__setattr__(training, name, value)
+    return training.enable_cache()
+
+
+def _get_cached_class(training_class: Type[Training]) -> Type[Training]:
+    """Получить вариант класса тренировки с кэшем показателей.
+
+    Вариант — наследник с тем же именем, поэтому сообщения о тренировке
+    не меняются. Кэш хранится в словаре атрибутов объекта.
+    """
+    cached = _CACHED_CLASSES.get(training_class)
+    if cached is not None:
+        return cached
+    if '_CACHED_VARIANT' in training_class.__dict__:
+        return training_class
+    with _REGISTRY_LOCK:
+        if training_class not in _CACHED_CLASSES:
+            namespace = {
+                name: _memoize_metric(name, training_class)
+                for name in CACHED_METRICS
+            }
+            namespace.update(__slots__=(),
+                             _CACHED_VARIANT=True,
+                             __reduce__=_reduce_cached,
+                             __setattr__=_invalidating_setattr,
+                             __module__=training_class.__module__)
+            _CACHED_CLASSES[training_class] = type(
+                training_class.__name__, (training_class,), namespace)
+        return _CACHED_CLASSES[training_class]
+
+
+def metrics_cache_counting(enabled: bool = True) -> None:
+    """Включить или выключить подсчёт попаданий и промахов кэша."""
+    global _COUNT_STATS
+    _COUNT_STATS = enabled
+
+
+def metrics_cache_info() -> MetricsCacheInfo:
+    """Получить число попаданий и промахов кэша показателей."""
+    with _STATS_LOCK:
+        hits, misses = _STATS_TOTAL
+        for counts in _STATS_COUNTS.values():
+            hits += counts[HITS]
+            misses += counts[MISSES]
+    return MetricsCacheInfo(hits, misses)
+
+
+def metrics_cache_reset() -> None:
+    """Обнулить счётчики кэша показателей."""
+    with _STATS_LOCK:
+        _STATS_TOTAL[:] = [0, 0]
+        for counts in _STATS_COUNTS.values():
+            counts[:] = [0, 0]
 
-    if workout_type not in dict_training:
-        raise ValueError('Неверные данные')
-    return dict_training[workout_type](*data)
 
+@dataclass
+class BatchResult:
+    """Столбцы рассчитанных показателей пакета тренировок."""
+
+    distance: array
+    speed: array
+    calories: array
 
-def main(training: Training) -> None:
+
+def read_package(workout_type: str, data: list) -> Training:
+    """Прочитать данные полученные от датчиков."""
+    entry = _DISPATCH.get(workout_type)
+    if entry is None or len(data) != entry[1]:
+        raise ValueError('Неверные данные')
+    return entry[0](*data)
+
+
+def _check_columns(size: int,
+                   **columns: Optional[Sequence[float]],
+                   ) -> List[Sequence[float]]:
+    """Проверить, что столбцы заданы и их длина равна `size`."""
+    for field, column in columns.items():
+        if column is None:
+            raise ValueError(f'Нет столбца {field}')
+        if len(column) != size:
+            raise ValueError(f'Длина столбца {field} не равна числу пакетов')
+    return list(columns.values())
+
+
+def calculate_batch(workout_types: Sequence[str],
+                    action: Sequence[float],
+                    duration: Sequence[float],
+                    weight: Sequence[float],
+                    **columns: Sequence[float],
+                    ) -> BatchResult:
+    """Рассчитать показатели для столбцов пакетов тренировок.
+
+    Дополнительные столбцы (``height``, ``length_pool``, ``count_pool``)
+    передаются по имени и нужны только для типов, которые их используют.
+    Записи группируются по коду тренировки, и каждая группа считается
+    одним проходом по формулам соответствующего класса. Каждый нужный
+    столбец должен быть той же длины, что и `workout_types`.
+    """
+    size = len(workout_types)
+    _check_columns(size, action=action, duration=duration, weight=weight)
+    groups: Dict[str, List[int]] = {}
+    for index, workout_type in enumerate(workout_types):
+        groups.setdefault(workout_type, []).append(index)
+
+    result = BatchResult(array('d', [0.0]) * size,
+                         array('d', [0.0]) * size,
+                         array('d', [0.0]) * size)
+    for workout_type, indexes in groups.items():
+        training_class = TRAINING_TYPES.get(workout_type)
+        if training_class is None:
+            raise ValueError('Неверные данные')
+        extra = _check_columns(size, **{
+            field: columns.get(field)
+            for field in training_class.EXTRA_FIELDS})
+        selected = [action, duration, weight] + extra
+        if len(indexes) != size:
+            selected = [[column[i] for i in indexes] for column in selected]
+        metrics = training_class.get_batch_metrics(*selected)
+        for target, values in zip((result.distance, result.speed,
+                                   result.calories), metrics):
+            if len(indexes) == size:
+                target[:] = array('d', values)
+            else:
+                for i, value in zip(indexes, values):
+                    target[i] = value
+    return result
+
+
+BatchRow = Tuple[str, float, float, float, float]
+
+
+def iter_batch_rows(workout_types: Sequence[str],
+                    duration: Sequence[float],
+                    result: BatchResult,
+                    ) -> Iterator[BatchRow]:
+    """Получить поля сообщений о тренировках по результату пакетного расчёта.
+
+    Строка — название тренировки, длительность, дистанция, скорость
+    и калории, в порядке полей `InfoMessage`.
+    """
+    names: Dict[str, str] = {}
+    for workout_type, *values in zip(workout_types, duration,
+                                     result.distance, result.speed,
+                                     result.calories):
+        name = names.get(workout_type)
+        if name is None:
+            training_class = TRAINING_TYPES.get(workout_type)
+            if training_class is None:
+                raise ValueError('Неверные данные')
+            name = names[workout_type] = training_class.__name__
+        yield (name, *values)
+
+
+def iter_batch_messages(workout_types: Sequence[str],
+                        duration: Sequence[float],
+                        result: BatchResult,
+                        ) -> Iterator[InfoMessage]:
+    """Получить сообщения о тренировках по результату пакетного расчёта."""
+    return starmap(InfoMessage,
+                   iter_batch_rows(workout_types, duration, result))
+
+
+def main(training: Training, sink: Optional['Sink'] = None) -> None:
     """Главная функция."""
     if training is not None:
         info: InfoMessage = training.show_training_info()
-        print(info.get_message())
+        if sink is None:
+            print(info.get_message())
+        else:
+            sink.write(info)
+
+
+CLI_ERRORS = (ValueError, TypeError, ArithmeticError, OSError)
+
+
+def to_number(value: str) -> float:
+    """Преобразовать текстовое значение датчика в число."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_package(text: str) -> Tuple[str, List[float]]:
+    """Разобрать пакет из аргумента вида ``RUN:15000,1,75``."""
+    workout_type, _, values = text.partition(':')
+    return workout_type, [to_number(value) for value in values.split(',')]
+
+
+def _parse_packages(texts: Iterable[str],
+                    on_error: Optional[Callable[[str, Exception], None]],
+                    ) -> Iterator[Tuple[str, List[float]]]:
+    """Разобрать пакеты из аргументов; ошибки передать в `on_error`."""
+    for text in texts:
+        try:
+            record = parse_package(text)
+        except ValueError as error:
+            if on_error is None:
+                raise
+            on_error(text, error)
+            continue
+        yield record
+
+
+def _file_records(path: str,
+                  fmt: Optional[str],
+                  stdin: IO,
+                  on_error: Optional[Callable[[str, Exception], None]],
+                  ) -> Iterator[Tuple[str, List[float]]]:
+    """Прочитать пакеты из файла или стандартного ввода."""
+    if path.endswith('.wktc'):
+        from columnar import ColumnarFile
+        with ColumnarFile(path) as file:
+            yield from file.records()
+        return
+    if path.endswith('.wkta'):
+        from archive import ArchiveFile
+        with ArchiveFile(path) as archive:
+            yield from archive.records()
+        return
+    from streaming import iter_records, parse_lines
+    if path == '-':
+        yield from parse_lines(stdin, fmt or 'csv', on_error)
+    else:
+        yield from iter_records(path, fmt, on_error)
+
+
+def run_cli(argv: Sequence[str],
+            stdin: Optional[IO] = None,
+            stdout: Optional[IO] = None,
+            stderr: Optional[IO] = None,
+            ) -> int:
+    """Рассчитать тренировки по аргументам командной строки.
+
+    Пакеты берутся из аргументов, файлов ``--file`` (CSV, JSON-строки,
+    двоичный столбцовый ``.wktc`` или архив ``.wkta``) и, если ни того
+    ни другого нет, из стандартного ввода. Модули чтения файлов, проверки
+    и параллельного расчёта загружаются только при их использовании.
+    """
+    import argparse
+    from itertools import chain
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    parser = argparse.ArgumentParser(
+        description='Расчёт информации о тренировках по пакетам датчиков.')
+    parser.add_argument('packages', nargs='*', metavar='CODE:DATA',
+                        help='пакет вида RUN:15000,1,75')
+    parser.add_argument('-f', '--file', action='append', default=[],
+                        help='файл с пакетами; "-" — стандартный ввод')
+    parser.add_argument('--format', choices=('csv', 'jsonl'),
+                        help='формат файлов и стандартного ввода')
+    parser.add_argument('--validate', action='store_true',
+                        help='пропускать ошибочные пакеты с отчётом в stderr')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='число процессов для параллельного расчёта')
+    args = parser.parse_args(argv)
+
+    files = args.file or ([] if args.packages else ['-'])
+    on_error = None
+    if args.validate:
+        from validation import DeadLetterSink, filter_valid
+        dead_letter = DeadLetterSink(stderr)
+        on_error = dead_letter.put_line
+    records: Iterator[Tuple[str, List[float]]] = chain(
+        _parse_packages(args.packages, on_error),
+        chain.from_iterable(
+            _file_records(path, args.format, stdin, on_error)
+            for path in files))
+    if args.validate:
+        records = filter_valid(records, dead_letter)
+    if args.workers:
+        from parallel import process_parallel
+        messages = process_parallel(records, workers=args.workers)
+    else:
+        messages = (read_package(workout_type, data).show_training_info()
+                    for workout_type, data in records)
+    errors: List[Exception] = []
+
+    def until_error(messages: Iterable[InfoMessage],
+                    ) -> Iterator[InfoMessage]:
+        # Ошибка останавливает поток, но уже рассчитанные сообщения
+        # из буфера `render_many` успевают записаться.
+        try:
+            yield from messages
+        except CLI_ERRORS as error:
+            errors.append(error)
+
+    render_many(until_error(messages), stdout)
+    if errors:
+        print(f'Ошибка: {errors[0]}', file=stderr)
+        return 1
+    return 0
 
 
 if __name__ == '__main__':
-    packages = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
-
-    for workout_type, data in packages:
-        training: Training = read_package(workout_type, data)
-        main(training)
+    # Расчёт идёт через импортированный модуль, чтобы реестр тренировок
+    # был общим с лениво загружаемыми модулями.
+    import homework
+    sys.exit(homework.run_cli(sys.argv[1:]))
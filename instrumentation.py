@@ -0,0 +1,200 @@
+import sys
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import homework
+
+BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0)
+FUNCTIONS: Tuple[str, ...] = ('read_package', 'main')
+METHODS: Tuple[str, ...] = (
+    'show_training_info', 'get_distance', 'get_mean_speed',
+    'get_spent_calories', 'get_message')
+PREFIX: str = 'fitness'
+
+Sampler = Callable[[str, Callable[[], Any]], Any]
+
+
+class Histogram:
+    """Гистограмма времени выполнения с фиксированными границами."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.errors: int = 0
+        self.total: float = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Учесть одно измерение в секундах."""
+        bucket = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += value
+
+    def reset(self) -> None:
+        """Обнулить измерения, не заменяя блокировку."""
+        with self.lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.errors = 0
+            self.total = 0.0
+
+
+class Instrumentation:
+    """Счётчики вызовов и гистограммы времени горячих функций модуля.
+
+    Пока замеры выключены, функции и методы модуля `homework` не
+    подменяются и ничего не стоят. `enable` оборачивает их, `disable`
+    возвращает исходные объекты на место.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.enabled: bool = False
+        self._originals: List[Tuple[Any, str, Any]] = []
+        self._lock = threading.Lock()
+
+    def enable(self,
+               sample_every: int = 0,
+               sampler: Optional[Sampler] = None,
+               ) -> None:
+        """Включить замеры.
+
+        С `sampler` каждый `sample_every`-й вызов функции выполняется
+        через ``sampler(name, call)``, например под профилировщиком.
+        """
+        with self._lock:
+            if self.enabled:
+                return
+            for name in FUNCTIONS:
+                original = getattr(homework, name)
+                wrapper = self._wrap(name, original, sample_every, sampler)
+                for module in list(sys.modules.values()):
+                    if getattr(module, name, None) is original:
+                        self._patch(module, name, wrapper)
+            classes = [homework.InfoMessage, homework.Training,
+                       *homework.TRAINING_TYPES.values()]
+            for cls in classes:
+                for name in METHODS:
+                    if name in cls.__dict__:
+                        label = f'{cls.__name__}.{name}'
+                        self._patch(cls, name, self._wrap(
+                            label, cls.__dict__[name], sample_every, sampler))
+            self.enabled = True
+
+    def disable(self) -> None:
+        """Выключить замеры и вернуть исходные функции."""
+        with self._lock:
+            for owner, name, original in reversed(self._originals):
+                setattr(owner, name, original)
+            self._originals = []
+            self.enabled = False
+
+    def reset(self) -> None:
+        """Обнулить накопленные замеры."""
+        with self._lock:
+            histograms = list(self.histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+    def _patch(self, owner: Any, name: str, value: Any) -> None:
+        self._originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, value)
+
+    def _wrap(self,
+              name: str,
+              func: Callable,
+              sample_every: int,
+              sampler: Optional[Sampler],
+              ) -> Callable:
+        """Обернуть функцию замером времени."""
+        histogram = self.histograms.setdefault(name, Histogram())
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                if sampler and sample_every and (
+                        histogram.count % sample_every == 0):
+                    return sampler(name, lambda: func(*args, **kwargs))
+                return func(*args, **kwargs)
+            except Exception:
+                with histogram.lock:
+                    histogram.errors += 1
+                raise
+            finally:
+                histogram.observe(perf_counter() - start)
+        return wrapper
+
+    def export_prometheus(self) -> str:
+        """Получить замеры в текстовом формате Prometheus."""
+        calls = f'{PREFIX}_calls_total'
+        errors = f'{PREFIX}_errors_total'
+        latency = f'{PREFIX}_latency_seconds'
+        lines = [f'# TYPE {calls} counter', f'# TYPE {errors} counter',
+                 f'# TYPE {latency} histogram']
+        for name, histogram in sorted(self.histograms.items()):
+            label = f'function="{name}"'
+            lines.append(f'{calls}{{{label}}} {histogram.count}')
+            lines.append(f'{errors}{{{label}}} {histogram.errors}')
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{latency}_bucket{{{label},le="{bound!r}"}} {cumulative}')
+            lines.append(
+                f'{latency}_bucket{{{label},le="+Inf"}} {histogram.count}')
+            lines.append(f'{latency}_sum{{{label}}} {histogram.total!r}')
+            lines.append(f'{latency}_count{{{label}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Записать замеры в файл для сборщика textfile."""
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.export_prometheus())
+
+    def serve_prometheus(self, port: int, host: str = '127.0.0.1') -> Any:
+        """Отдавать замеры по HTTP в фоновом потоке; вернуть сервер."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        instrumentation = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = instrumentation.export_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class ProfileSampler:
+    """Выполнение выбранных вызовов под `cProfile`."""
+
+    def __init__(self) -> None:
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def __call__(self, name: str, call: Callable[[], Any]) -> Any:
+        return self.profile.runcall(call)
+
+
+INSTRUMENTATION = Instrumentation()
+enable = INSTRUMENTATION.enable
+disable = INSTRUMENTATION.disable
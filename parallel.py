@@ -0,0 +1,110 @@
+import os
+from array import array
+from collections import deque
+from concurrent.futures import (Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence
+
+from homework import BatchResult, InfoMessage, calculate_batch, read_package
+from streaming import Record
+
+CHUNK_SIZE: int = 1000
+BATCH_CHUNK_SIZE: int = 65536
+
+
+def chunked(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Разбить поток пакетов на списки длиной не более `size`."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_chunk(chunk: List[Record]) -> List[InfoMessage]:
+    """Рассчитать сообщения для части пакетов в рабочем процессе."""
+    return [read_package(workout_type, data).show_training_info()
+            for workout_type, data in chunk]
+
+
+def process_parallel(records: Iterable[Record],
+                     workers: Optional[int] = None,
+                     chunk_size: int = CHUNK_SIZE,
+                     max_pending: Optional[int] = None,
+                     ) -> Iterator[InfoMessage]:
+    """Рассчитать сообщения о тренировках в пуле процессов.
+
+    Пакеты отправляются частями по `chunk_size`, в работе одновременно
+    находится не больше `max_pending` частей, поэтому входной поток
+    читается по мере готовности результатов. Сообщения возвращаются
+    в исходном порядке. При ошибке оставшиеся части отменяются,
+    а пул закрывается до того, как исключение дойдёт до вызывающего.
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер части должен быть положительным')
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    if max_pending < 1:
+        raise ValueError('Число частей в работе должно быть положительным')
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque['Future[List[InfoMessage]]'] = deque()
+        try:
+            for chunk in chunked(records, chunk_size):
+                pending.append(executor.submit(process_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def calculate_batch_threaded(workout_types: Sequence[str],
+                             action: Sequence[float],
+                             duration: Sequence[float],
+                             weight: Sequence[float],
+                             workers: Optional[int] = None,
+                             chunk_size: int = BATCH_CHUNK_SIZE,
+                             executor: Optional[ThreadPoolExecutor] = None,
+                             **columns: Sequence[float],
+                             ) -> BatchResult:
+    """Рассчитать столбцы пакетов `calculate_batch` в пуле потоков.
+
+    Столбцы делятся на части по `chunk_size`; каждая часть считается
+    в своём потоке со своими промежуточными списками, а результаты
+    собираются в вызывающем потоке. Ускорение дают сборки CPython
+    без GIL (3.13t и новее); с GIL результат тот же, что у
+    `calculate_batch`. Можно передать общий `executor` сервера.
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер части должен быть положительным')
+    size = len(workout_types)
+    bounds = [(start, min(start + chunk_size, size))
+              for start in range(0, size, chunk_size)]
+    if len(bounds) <= 1:
+        return calculate_batch(workout_types, action, duration, weight,
+                               **columns)
+
+    def work(start: int, stop: int) -> BatchResult:
+        return calculate_batch(
+            workout_types[start:stop], action[start:stop],
+            duration[start:stop], weight[start:stop],
+            **{name: column[start:stop] for name, column in columns.items()})
+
+    pool = executor or ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(work, *bound) for bound in bounds]
+        parts = [future.result() for future in futures]
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+    result = BatchResult(array('d'), array('d'), array('d'))
+    for part in parts:
+        result.distance.extend(part.distance)
+        result.speed.extend(part.speed)
+        result.calories.extend(part.calories)
+    return result
@@ -0,0 +1,99 @@
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple, Type
+
+from homework import BASE_FIELDS, TRAINING_TYPES, InfoMessage, Training
+from streaming import Record
+
+MAXSIZE: int = 65536
+
+Profile = Tuple[Type[Training], Tuple[float, ...]]
+
+
+class AthleteIndex:
+    """Таблица множителей формул по спортсменам.
+
+    Спортсмен — код тренировки и значения `ATHLETE_FIELDS` класса
+    (вес, рост, длина бассейна). Множители считаются
+    `get_athlete_factors` один раз на спортсмена, а расчёт тренировки
+    идёт через `get_profiled_metrics`; результаты совпадают
+    с `show_training_info` бит в бит. Хранится не больше `maxsize`
+    спортсменов: при переполнении таблица очищается.
+
+    Таблица не ускоряет расчёт: чтобы результат совпадал бит в бит,
+    заранее считается не больше одного умножения, а поиск спортсмена
+    по ключу стоит дороже. На потоке одного типа она медленнее
+    `read_package` и `show_training_info`, на смешанном — примерно
+    равна им (замеры ``AthleteIndex.calculate`` и ``AthleteIndex.scalar``
+    в `benchmarks`). Для скорости нужен `calculate_batch`; сгруппировать
+    записи по спортсменам для прохода по столбцам не помогает, так как
+    время уходит на создание `InfoMessage`, а не на формулы.
+    """
+
+    def __init__(self, maxsize: int = MAXSIZE) -> None:
+        self.maxsize: int = maxsize
+        self.profiles: Dict[Hashable, Profile] = {}
+        self.layouts: Dict[str, Tuple[int, int]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _layout(self, workout_type: str) -> Tuple[int, int]:
+        """Получить число параметров пакета и конец параметров спортсмена."""
+        layout = self.layouts.get(workout_type)
+        if layout is None:
+            training_class = TRAINING_TYPES.get(workout_type)
+            if training_class is None:
+                raise ValueError('Неверные данные')
+            fields = BASE_FIELDS + training_class.EXTRA_FIELDS
+            athlete = training_class.ATHLETE_FIELDS
+            if fields[2:2 + len(athlete)] != athlete:
+                raise TypeError(
+                    f'ATHLETE_FIELDS {training_class.__name__} должны идти '
+                    'в конструкторе сразу после duration')
+            layout = self.layouts[workout_type] = (
+                len(fields), 2 + len(athlete))
+        return layout
+
+    def profile(self, workout_type: str, *athlete: float) -> Profile:
+        """Получить класс тренировки и множители спортсмена."""
+        key = (workout_type, *athlete)
+        profile = self.profiles.get(key)
+        if profile is not None:
+            self.hits += 1
+            return profile
+        self.misses += 1
+        training_class = TRAINING_TYPES[workout_type]
+        profile = (training_class,
+                   training_class.get_athlete_factors(*athlete))
+        # 0.0 и -0.0 дают один ключ, но разные множители.
+        if 0 not in athlete:
+            if len(self.profiles) >= self.maxsize:
+                self.profiles.clear()
+            self.profiles[key] = profile
+        return profile
+
+    def calculate(self, workout_type: str, data: List[float]) -> InfoMessage:
+        """Рассчитать сообщение о тренировке по пакету `read_package`."""
+        arity, end = self._layout(workout_type)
+        if len(data) != arity:
+            raise ValueError('Неверные данные')
+        training_class, factors = self.profile(workout_type, *data[2:end])
+        action, duration = data[0], data[1]
+        return InfoMessage(training_class.__name__, duration,
+                           *training_class.get_profiled_metrics(
+                               factors, action, duration, *data[end:]))
+
+    def calculate_many(self,
+                       records: Iterable[Record],
+                       ) -> Iterator[InfoMessage]:
+        """Рассчитать сообщения для потока пакетов."""
+        calculate = self.calculate
+        for workout_type, data in records:
+            yield calculate(workout_type, data)
+
+    def clear(self) -> None:
+        """Очистить таблицу спортсменов и счётчики."""
+        self.profiles.clear()
+        self.layouts.clear()
+        self.hits = self.misses = 0
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from homework import InfoMessage, read_package
+
+MAXSIZE: int = 65536
+COMMIT_EVERY: int = 1000
+
+Key = Tuple[str, Tuple[float, ...]]
+
+
+class ResultCache:
+    """Кэш сообщений о тренировках по содержимому пакета.
+
+    Ключ — код тренировки и параметры, приведённые к `float`.
+    В памяти хранится не больше `maxsize` последних сообщений;
+    с `path` вытесненные и новые сообщения сохраняются в SQLite
+    и переживают перезапуск. Возвращаемые сообщения общие для всех
+    обращений, изменять их нельзя. Кэш можно делить между потоками:
+    обращения к словарю и базе идут под блокировкой, расчёт — без неё.
+    """
+
+    def __init__(self,
+                 maxsize: int = MAXSIZE,
+                 path: Optional[str] = None,
+                 ) -> None:
+        if maxsize < 1:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.maxsize: int = maxsize
+        self.memory: 'OrderedDict[Key, InfoMessage]' = OrderedDict()
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.db: Optional[sqlite3.Connection] = None
+        self._pending: int = 0
+        self._lock = threading.Lock()
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, training_type TEXT, duration REAL, '
+                'distance REAL, speed REAL, calories REAL)')
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля запросов, обслуженных без расчёта."""
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def get_info(self, workout_type: str, data: list) -> InfoMessage:
+        """Получить сообщение о тренировке из кэша или рассчитать его."""
+        values = tuple(map(float, data))
+        if 0 in values:
+            # 0.0 и -0.0 дают один ключ, но разные строки сообщения.
+            with self._lock:
+                self.misses += 1
+            return read_package(workout_type, data).show_training_info()
+        key = (workout_type, values)
+        with self._lock:
+            info = self.memory.get(key)
+            if info is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return info
+            info = self._load(key)
+            if info is not None:
+                self.disk_hits += 1
+                self._remember(key, info)
+                return info
+            self.misses += 1
+        info = read_package(workout_type, data).show_training_info()
+        with self._lock:
+            self._store(key, info)
+            self._remember(key, info)
+        return info
+
+    def _remember(self, key: Key, info: InfoMessage) -> None:
+        self.memory[key] = info
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    @staticmethod
+    def _disk_key(key: Key) -> str:
+        workout_type, values = key
+        return workout_type + ':' + ','.join(map(repr, values))
+
+    def _load(self, key: Key) -> Optional[InfoMessage]:
+        if self.db is None:
+            return None
+        row = self.db.execute(
+            'SELECT training_type, duration, distance, speed, calories '
+            'FROM results WHERE key = ?', (self._disk_key(key),)).fetchone()
+        return InfoMessage(*row) if row is not None else None
+
+    def _store(self, key: Key, info: InfoMessage) -> None:
+        if self.db is None:
+            return
+        self.db.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+            (self._disk_key(key), info.training_type, info.duration,
+             info.distance, info.speed, info.calories))
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.db.commit()
+            self._pending = 0
+
+    def clear(self) -> None:
+        """Очистить кэш в памяти и счётчики."""
+        with self._lock:
+            self.memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def close(self) -> None:
+        """Сохранить сообщения на диск и закрыть базу."""
+        with self._lock:
+            if self.db is not None:
+                self.db.commit()
+                self.db.close()
+                self.db = None
@@ -0,0 +1,179 @@
+import math
+from typing import Dict, Hashable, Optional, Tuple, Type
+
+from homework import TRAINING_TYPES, InfoMessage, Training
+
+SEC_IN_HOUR: float = 3600
+LAP_FIELD: str = 'count_pool'
+WINDOW: float = 60.0
+
+
+class SegmentTracker:
+    """Расчёт отрезков тренировки по потоку отсчётов датчика.
+
+    Отсчёт — момент времени в секундах, число шагов или гребков
+    с прошлого отсчёта и, для плавания, число проплытых бассейнов.
+    Отрезок закрывается на первом отсчёте, где пройдено `split`
+    километров (или `split` бассейнов, если тренировка считает
+    бассейны). Показатели отрезков и всей тренировки считаются
+    формулами класса тренировки. Скользящие показатели `rolling`
+    считаются по суммам с экспоненциальным затуханием за `window`
+    секунд. Трекер хранит только суммы, поэтому память не зависит
+    от длины тренировки.
+    """
+
+    __slots__ = ('training_class', 'weight', 'extra', 'split', 'by_laps',
+                 'window', 'start', 'last', 'actions', 'laps',
+                 'split_start', 'split_actions', 'split_laps',
+                 'rolling_actions', 'rolling_seconds', 'rolling_laps')
+
+    def __init__(self,
+                 workout_type: str,
+                 weight: float,
+                 start: float = 0.0,
+                 split: float = 1.0,
+                 window: float = WINDOW,
+                 **extra: float,
+                 ) -> None:
+        training_class = TRAINING_TYPES.get(workout_type)
+        if training_class is None:
+            raise ValueError('Неверные данные')
+        if split <= 0:
+            raise ValueError('Длина отрезка должна быть положительной')
+        if window <= 0:
+            raise ValueError('Окно должно быть положительным')
+        self.training_class: Type[Training] = training_class
+        self.by_laps: bool = LAP_FIELD in self.training_class.EXTRA_FIELDS
+        missing = set(self.training_class.EXTRA_FIELDS) - set(extra)
+        if missing - {LAP_FIELD}:
+            raise ValueError(f'Не заданы параметры: {sorted(missing)}')
+        self.weight: float = weight
+        self.extra: Dict[str, float] = extra
+        self.split: float = split
+        self.window: float = window
+        self.start: float = start
+        self.last: float = start
+        self.actions: float = 0
+        self.laps: float = 0
+        self.split_start: float = start
+        self.split_actions: float = 0
+        self.split_laps: float = 0
+        self.rolling_actions: float = 0
+        self.rolling_seconds: float = 0
+        self.rolling_laps: float = 0
+
+    def _training(self,
+                  actions: float,
+                  seconds: float,
+                  laps: float,
+                  ) -> Training:
+        """Создать тренировку для отрезка с заданными суммами."""
+        values = dict(self.extra, **{LAP_FIELD: laps})
+        return self.training_class(
+            actions, seconds / SEC_IN_HOUR, self.weight,
+            *(values[field] for field in self.training_class.EXTRA_FIELDS))
+
+    def _split_length(self) -> float:
+        """Пройденная часть текущего отрезка в км или бассейнах."""
+        if self.by_laps:
+            return self.split_laps
+        training_class = self.training_class
+        return (self.split_actions * training_class.LEN_STEP
+                / training_class.M_IN_KM)
+
+    def add(self,
+            timestamp: float,
+            actions: float,
+            laps: float = 0,
+            ) -> Optional[InfoMessage]:
+        """Учесть отсчёт; вернуть сообщение, если отрезок закрыт."""
+        if timestamp <= self.last:
+            raise ValueError('Отсчёты должны идти по возрастанию времени')
+        seconds = timestamp - self.last
+        decay = math.exp(-seconds / self.window)
+        self.rolling_actions = self.rolling_actions * decay + actions
+        self.rolling_seconds = self.rolling_seconds * decay + seconds
+        self.rolling_laps = self.rolling_laps * decay + laps
+        self.last = timestamp
+        self.actions += actions
+        self.laps += laps
+        self.split_actions += actions
+        self.split_laps += laps
+        if self._split_length() >= self.split:
+            return self._close_split()
+        return None
+
+    def _close_split(self) -> InfoMessage:
+        """Закрыть текущий отрезок и начать следующий."""
+        info = self._training(self.split_actions,
+                              self.last - self.split_start,
+                              self.split_laps).show_training_info()
+        self.split_start = self.last
+        self.split_actions = 0
+        self.split_laps = 0
+        return info
+
+    def current(self) -> InfoMessage:
+        """Получить показатели тренировки с начала до последнего отсчёта."""
+        if self.last == self.start:
+            raise ValueError('Нет ни одного отсчёта')
+        return self._training(self.actions, self.last - self.start,
+                              self.laps).show_training_info()
+
+    def rolling(self) -> InfoMessage:
+        """Получить показатели за последние примерно `window` секунд.
+
+        Отсчёты входят в суммы с весом ``exp(-t / window)``, где t —
+        время с отсчёта, поэтому память не зависит от размера окна.
+        """
+        if self.last == self.start:
+            raise ValueError('Нет ни одного отсчёта')
+        return self._training(self.rolling_actions, self.rolling_seconds,
+                              self.rolling_laps).show_training_info()
+
+    def finish(self) -> Optional[InfoMessage]:
+        """Закрыть последний неполный отрезок, если он не пустой."""
+        if self.last == self.split_start:
+            return None
+        return self._close_split()
+
+
+class SessionManager:
+    """Трекеры отрезков для множества одновременных тренировок."""
+
+    def __init__(self, split: float = 1.0, window: float = WINDOW) -> None:
+        self.split: float = split
+        self.window: float = window
+        self.sessions: Dict[Hashable, SegmentTracker] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def start(self,
+              session: Hashable,
+              workout_type: str,
+              weight: float,
+              start: float = 0.0,
+              **extra: float,
+              ) -> SegmentTracker:
+        """Начать отслеживание тренировки."""
+        tracker = SegmentTracker(workout_type, weight, start, self.split,
+                                 self.window, **extra)
+        self.sessions[session] = tracker
+        return tracker
+
+    def add(self,
+            session: Hashable,
+            timestamp: float,
+            actions: float,
+            laps: float = 0,
+            ) -> Optional[InfoMessage]:
+        """Учесть отсчёт тренировки; вернуть закрытый отрезок."""
+        return self.sessions[session].add(timestamp, actions, laps)
+
+    def finish(self,
+               session: Hashable,
+               ) -> Tuple[Optional[InfoMessage], InfoMessage]:
+        """Завершить тренировку: последний отрезок и итог тренировки."""
+        tracker = self.sessions.pop(session)
+        return tracker.finish(), tracker.current()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+from dataclasses import asdict
+from typing import List, Optional, Tuple
+
+from homework import read_package
+
+MAX_CONNECTIONS: int = 10000
+QUEUE_SIZE: int = 64
+MAX_LINE: int = 64 * 1024
+
+
+def process_line(line: bytes) -> bytes:
+    """Рассчитать ответ на один пакет в формате JSON-строки.
+
+    Пакет — ``["RUN", [15000, 1, 75]]``, ответ — поля `InfoMessage`
+    с готовой строкой в ``message`` или ``{"error": "..."}``. Любая
+    ошибка разбора или расчёта становится ответом, чтобы соединение
+    устройства не обрывалось.
+    """
+    try:
+        workout_type, data = json.loads(line)
+        info = read_package(workout_type, data).show_training_info()
+        response = asdict(info)
+        response['message'] = info.get_message()
+    except Exception as error:
+        response = {'error': str(error) or error.__class__.__name__}
+    return json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class WorkoutServer:
+    """Асинхронный приём пакетов от датчиков по TCP или Unix-сокету.
+
+    Каждое соединение передаёт пакеты по одному в строке. Ответы
+    проходят через очередь на `queue_size` строк: пока клиент не
+    забирает ответы, чтение его пакетов приостанавливается. Число
+    одновременно обслуживаемых соединений ограничено `max_connections`,
+    остальные ждут освобождения места.
+    """
+
+    def __init__(self,
+                 max_connections: int = MAX_CONNECTIONS,
+                 queue_size: int = QUEUE_SIZE,
+                 max_line: int = MAX_LINE,
+                 ) -> None:
+        self.max_connections: int = max_connections
+        self.queue_size: int = queue_size
+        self.max_line: int = max_line
+        self.processed: int = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self,
+                    host: Optional[str] = None,
+                    port: Optional[int] = None,
+                    path: Optional[str] = None,
+                    ) -> asyncio.AbstractServer:
+        """Начать приём соединений по адресу или пути Unix-сокета."""
+        self._slots = asyncio.Semaphore(self.max_connections)
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle, path, limit=self.max_line)
+        return await asyncio.start_server(
+            self.handle, host, port, limit=self.max_line)
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter,
+                     ) -> None:
+        """Обслужить одно соединение устройства."""
+        async with self._slots:
+            queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            sender = asyncio.ensure_future(self._send(queue, writer))
+            try:
+                while True:
+                    response = await self._respond(reader)
+                    if response is None:
+                        break
+                    if response:
+                        await queue.put(response)
+                        self.processed += 1
+            except ConnectionError:
+                pass
+            finally:
+                await queue.put(None)
+                await asyncio.gather(sender, return_exceptions=True)
+                writer.close()
+
+    async def _respond(self,
+                       reader: asyncio.StreamReader,
+                       ) -> Optional[bytes]:
+        """Прочитать пакет и получить ответ; None — конец потока.
+
+        Пустая строка даёт пустой ответ. Пакет длиннее `max_line`
+        пропускается до конца строки, ответом на него будет ошибка.
+        """
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:
+            if not error.partial:
+                return None
+            line = error.partial
+        except asyncio.LimitOverrunError:
+            await self._skip_line(reader)
+            return json.dumps(
+                {'error': f'Пакет длиннее {self.max_line} байт'},
+                ensure_ascii=False).encode('utf-8') + b'\n'
+        return process_line(line) if line.strip() else b''
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader) -> None:
+        """Пропустить данные до конца строки."""
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+
+    @staticmethod
+    async def _send(queue: asyncio.Queue,
+                    writer: asyncio.StreamWriter,
+                    ) -> None:
+        """Отправлять ответы из очереди с учётом скорости клиента.
+
+        После обрыва соединения очередь продолжает разбираться, чтобы
+        чтение пакетов не зависло на заполненной очереди.
+        """
+        connected = True
+        while True:
+            response = await queue.get()
+            if response is None:
+                return
+            if not connected:
+                continue
+            try:
+                writer.write(response)
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+
+async def fake_device(host: Optional[str],
+                      port: Optional[int],
+                      packages: List[Tuple[str, list]],
+                      path: Optional[str] = None,
+                      ) -> List[dict]:
+    """Отправить пакеты от имени одного устройства и получить ответы."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.writelines(json.dumps(package).encode('utf-8') + b'\n'
+                          for package in packages)
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in packages]
+    finally:
+        writer.close()
+
+
+async def run_fake_devices(devices: int,
+                           packages: List[Tuple[str, list]],
+                           host: Optional[str] = None,
+                           port: Optional[int] = None,
+                           path: Optional[str] = None,
+                           ) -> List[List[dict]]:
+    """Нагрузить сервер одновременными соединениями устройств."""
+    return await asyncio.gather(*(
+        fake_device(host, port, packages, path) for _ in range(devices)))
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765) -> None:
+    """Запустить сервер и обслуживать соединения до остановки."""
+    server = await WorkoutServer().start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(serve())
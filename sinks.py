@@ -0,0 +1,207 @@
+import csv
+import json
+import queue
+import struct
+import sys
+import threading
+from array import array
+from typing import IO, Iterable, Iterator, List, Optional
+
+from homework import InfoMessage, render_many
+
+BATCH_SIZE: int = 4096
+QUEUE_SIZE: int = 8
+FIELDS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+BLOCK_HEADER = struct.Struct('<4sII')
+MAGIC: bytes = b'WKTR'
+
+
+class Sink:
+    """Буферизованный приёмник сообщений о тренировках.
+
+    Сообщения копятся в буфере и передаются в `write_batch` блоками
+    по `batch_size`. Наследники реализуют только `write_batch`.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE) -> None:
+        self.batch_size: int = batch_size
+        self.buffer: List[InfoMessage] = []
+        self.count: int = 0
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, info: InfoMessage) -> None:
+        """Принять одно сообщение."""
+        self.buffer.append(info)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, messages: Iterable[InfoMessage]) -> None:
+        """Принять поток сообщений."""
+        for info in messages:
+            self.write(info)
+
+    def flush(self) -> None:
+        """Записать накопленные сообщения."""
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            self.write_batch(batch)
+            self.count += len(batch)
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        """Записать блок сообщений."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Записать остаток буфера."""
+        self.flush()
+
+
+class TextSink(Sink):
+    """Строки сообщений, как их печатает `main`."""
+
+    def __init__(self,
+                 out: Optional[IO] = None,
+                 batch_size: int = BATCH_SIZE,
+                 ) -> None:
+        super().__init__(batch_size)
+        self.out: IO = out or sys.stdout
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        render_many(batch, self.out, buffer_size=len(batch))
+
+
+class JsonLinesSink(Sink):
+    """Поля сообщений объектами JSON по одному в строке."""
+
+    def __init__(self, out: IO, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(batch_size)
+        self.out: IO = out
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        dumps = json.dumps
+        self.out.write(''.join(
+            dumps(dict(zip(FIELDS, (info.training_type, info.duration,
+                                    info.distance, info.speed,
+                                    info.calories))),
+                  ensure_ascii=False) + '\n'
+            for info in batch))
+
+
+class CsvSink(Sink):
+    """Поля сообщений строками CSV с заголовком."""
+
+    def __init__(self, out: IO, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(batch_size)
+        self.writer = csv.writer(out)
+        self.writer.writerow(FIELDS)
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        self.writer.writerows(
+            (info.training_type, info.duration, info.distance, info.speed,
+             info.calories) for info in batch)
+
+
+class BinarySink(Sink):
+    """Двоичные столбцы сообщений.
+
+    Каждый блок — заголовок с числом записей и длиной списка типов,
+    типы тренировок через перевод строки в UTF-8, выравнивание на 8 байт
+    и четыре столбца ``float64``: длительность, дистанция, скорость,
+    калории.
+    """
+
+    def __init__(self, out: IO, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(batch_size)
+        self.out: IO = out
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        names = '\n'.join(info.training_type for info in batch).encode()
+        parts = [BLOCK_HEADER.pack(MAGIC, len(batch), len(names)), names,
+                 bytes(-len(names) % 8)]
+        for field in FIELDS[1:]:
+            column = array('d', (getattr(info, field) for info in batch))
+            if sys.byteorder != 'little':
+                column.byteswap()
+            parts.append(column.tobytes())
+        self.out.write(b''.join(parts))
+
+
+def read_binary(data: bytes) -> Iterator[InfoMessage]:
+    """Прочитать сообщения, записанные `BinarySink`."""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        magic, count, size = BLOCK_HEADER.unpack_from(view, offset)
+        if magic != MAGIC:
+            raise ValueError('Неверный формат результатов')
+        offset += BLOCK_HEADER.size
+        names = bytes(view[offset:offset + size]).decode().split('\n')
+        offset += size + -size % 8
+        columns = []
+        for _ in FIELDS[1:]:
+            column = array('d')
+            column.frombytes(view[offset:offset + 8 * count])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns.append(column)
+            offset += 8 * count
+        for values in zip(names, *columns):
+            yield InfoMessage(*values)
+
+
+class BackgroundSink(Sink):
+    """Запись блоков другим приёмником в фоновом потоке.
+
+    Расчёт продолжается, пока поток пишет предыдущие блоки; очередь
+    на `queue_size` блоков ограничивает расход памяти. Ошибка записи
+    поднимается при следующей записи или при закрытии.
+    """
+
+    def __init__(self,
+                 sink: Sink,
+                 batch_size: int = BATCH_SIZE,
+                 queue_size: int = QUEUE_SIZE,
+                 ) -> None:
+        super().__init__(batch_size)
+        self.sink: Sink = sink
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.sink.write_many(batch)
+                self.sink.flush()
+            except BaseException as error:
+                self.error = error
+
+    def _raise(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def write_batch(self, batch: List[InfoMessage]) -> None:
+        self._raise()
+        self.queue.put(batch)
+
+    def close(self) -> None:
+        """Дописать все блоки, остановить поток и закрыть приёмник."""
+        if self.thread.is_alive():
+            try:
+                self.flush()
+            finally:
+                self.queue.put(None)
+                self.thread.join()
+            self.sink.close()
+        self._raise()
@@ -0,0 +1,160 @@
+import tracemalloc
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Type
+
+from homework import (TRAINING_TYPES, BatchResult, InfoMessage, Training,
+                      calculate_batch, read_package)
+from streaming import Record
+
+COLUMNS = ('action', 'duration', 'weight',
+           'height', 'length_pool', 'count_pool')
+
+
+class WorkoutView:
+    """Лёгкое представление одной записи таблицы тренировок.
+
+    Методы расчёта вызывают формулы класса тренировки, подставляя
+    представление вместо объекта: поля читаются из столбцов таблицы,
+    константы — из класса тренировки.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'WorkoutTable', index: int) -> None:
+        self.table: WorkoutTable = table
+        self.index: int = index
+
+    @property
+    def training_class(self) -> Type[Training]:
+        """Класс тренировки записи."""
+        return self.table.classes[self.table.types[self.index]]
+
+    def __getattr__(self, name: str) -> Any:
+        if name in COLUMNS:
+            return getattr(self.table, name)[self.index]
+        return getattr(self.training_class, name)
+
+    def get_distance(self) -> float:
+        """Получить дистанцию в км."""
+        return self.training_class.get_distance(self)
+
+    def get_mean_speed(self) -> float:
+        """Получить среднюю скорость движения."""
+        return self.training_class.get_mean_speed(self)
+
+    def get_spent_calories(self) -> float:
+        """Получить количество затраченных калорий."""
+        return self.training_class.get_spent_calories(self)
+
+    def show_training_info(self) -> InfoMessage:
+        """Вернуть информационное сообщение о выполненной тренировке."""
+        return InfoMessage(
+            self.training_class.__name__,
+            self.duration,
+            self.get_distance(),
+            self.get_mean_speed(),
+            self.get_spent_calories())
+
+    def to_training(self) -> Training:
+        """Создать полноценный объект тренировки."""
+        training_class = self.training_class
+        fields = COLUMNS[:3] + training_class.EXTRA_FIELDS
+        return training_class(*(getattr(self, field) for field in fields))
+
+
+class WorkoutTable:
+    """Таблица тренировок с хранением по столбцам.
+
+    Код тренировки хранится номером в `codes`, параметры — в столбцах
+    ``array('d')``; неиспользуемые типом тренировки поля равны нулю.
+    """
+
+    def __init__(self, records: Iterable[Record] = ()) -> None:
+        self.codes: List[str] = []
+        self.classes: List[Type[Training]] = []
+        self.code_index: Dict[str, int] = {}
+        self.types: array = array('B')
+        for column in COLUMNS:
+            setattr(self, column, array('d'))
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> WorkoutView:
+        if not -len(self) <= index < len(self):
+            raise IndexError('Нет тренировки с таким номером')
+        return WorkoutView(self, index % len(self))
+
+    def __iter__(self) -> Iterator[WorkoutView]:
+        return (WorkoutView(self, index) for index in range(len(self)))
+
+    def append(self, workout_type: str, data: List[float]) -> None:
+        """Добавить пакет тренировки в таблицу."""
+        training_class = TRAINING_TYPES.get(workout_type)
+        if training_class is None:
+            raise ValueError('Неверные данные')
+        fields = COLUMNS[:3] + training_class.EXTRA_FIELDS
+        if len(data) != len(fields):
+            raise ValueError('Неверные данные')
+        try:
+            values = dict(zip(fields, map(float, data)))
+        except (TypeError, ValueError):
+            raise ValueError('Неверные данные') from None
+        if workout_type not in self.code_index:
+            if not set(fields) <= set(COLUMNS):
+                raise ValueError(
+                    f'Тренировку {workout_type} нельзя хранить в таблице')
+            self.code_index[workout_type] = len(self.codes)
+            self.codes.append(workout_type)
+            self.classes.append(training_class)
+        self.types.append(self.code_index[workout_type])
+        for column in COLUMNS:
+            getattr(self, column).append(values.get(column, 0.0))
+
+    def extend(self, records: Iterable[Record]) -> None:
+        """Добавить пакеты тренировок в таблицу."""
+        for workout_type, data in records:
+            self.append(workout_type, data)
+
+    def workout_types(self) -> List[str]:
+        """Получить коды тренировок всех записей."""
+        codes = self.codes
+        return [codes[index] for index in self.types]
+
+    def calculate(self) -> BatchResult:
+        """Рассчитать показатели всех записей пакетным проходом."""
+        return calculate_batch(
+            self.workout_types(),
+            **{column: getattr(self, column) for column in COLUMNS})
+
+
+def memory_report(records: List[Record]) -> Dict[str, float]:
+    """Измерить число байт на тренировку для разных представлений."""
+    builders = {
+        'Training': lambda: [read_package(*record) for record in records],
+        'InfoMessage': lambda: [read_package(*record).show_training_info()
+                                for record in records],
+        'WorkoutTable': lambda: WorkoutTable(records),
+    }
+    report = {}
+    for name, build in builders.items():
+        tracemalloc.start()
+        try:
+            result = build()
+            report[name] = tracemalloc.get_traced_memory()[0] / len(records)
+        finally:
+            tracemalloc.stop()
+        del result
+    return report
+
+
+if __name__ == '__main__':
+    packages = [
+        ('SWM', [720.5, 1.5, 80.5, 25.0, 40.0]),
+        ('RUN', [15000.5, 1.5, 75.5]),
+        ('WLK', [9000.5, 1.5, 75.5, 180.0]),
+    ] * 100000
+
+    for name, size in memory_report(packages).items():
+        print(f'{name}: {size:.1f} байт на тренировку')
@@ -0,0 +1,144 @@
+import csv
+import json
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, Union)
+
+from homework import (BASE_FIELDS, TRAINING_TYPES, InfoMessage, Training,
+                      read_package, to_number)
+
+Record = Tuple[str, List[float]]
+OnError = Optional[Callable[[str, Exception], None]]
+
+FORMATS: Tuple[str, ...] = ('csv', 'jsonl')
+SUFFIXES = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """Определить формат файла пакетов по расширению."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in SUFFIXES:
+        raise ValueError(f'Неизвестный формат файла: {path}')
+    return SUFFIXES[suffix]
+
+
+def parse_csv(lines: Iterable[str], on_error: OnError = None,
+              ) -> Iterator[Record]:
+    """Прочитать пакеты из строк вида ``SWM,720,1,80,25,40``.
+
+    Если задан `on_error`, строка, которую нельзя разобрать, передаётся
+    в него вместе с ошибкой и пропускается.
+    """
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        workout_type, *data = row
+        try:
+            values = [to_number(value) for value in data]
+        except ValueError as error:
+            if on_error is None:
+                raise
+            on_error(','.join(row), error)
+            continue
+        yield workout_type.strip(), values
+
+
+def parse_jsonl(lines: Iterable[str], on_error: OnError = None,
+                ) -> Iterator[Record]:
+    """Прочитать пакеты из строк JSON.
+
+    Каждая строка — ``["SWM", [720, 1, 80, 25, 40]]`` или
+    ``{"workout_type": "SWM", "data": [720, 1, 80, 25, 40]}``.
+    Ошибки разбора обрабатываются, как в `parse_csv`.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = _parse_json_package(line)
+        except (ValueError, TypeError) as error:
+            if on_error is None:
+                raise
+            on_error(line.rstrip('\r\n'), error)
+            continue
+        yield record
+
+
+def _parse_json_package(line: str) -> Record:
+    """Разобрать одну строку JSON с пакетом."""
+    package = json.loads(line)
+    if isinstance(package, dict):
+        try:
+            return package['workout_type'], package['data']
+        except KeyError as error:
+            raise ValueError(f'В пакете нет поля {error}') from None
+    workout_type, data = package
+    return workout_type, data
+
+
+def parse_lines(lines: Iterable[str],
+                fmt: str,
+                on_error: OnError = None,
+                ) -> Iterator[Record]:
+    """Прочитать пакеты из строк в формате ``csv`` или ``jsonl``."""
+    if fmt == 'csv':
+        return parse_csv(lines, on_error)
+    if fmt == 'jsonl':
+        return parse_jsonl(lines, on_error)
+    raise ValueError(f'Неизвестный формат пакетов: {fmt}')
+
+
+def iter_records(path: Union[str, Path],
+                 fmt: Optional[str] = None,
+                 on_error: OnError = None,
+                 ) -> Iterator[Record]:
+    """Построчно прочитать пакеты из файла, не загружая его целиком."""
+    fmt = fmt or detect_format(path)
+    with open(path, encoding='utf-8', newline='') as file:
+        yield from parse_lines(file, fmt, on_error)
+
+
+def to_columns(records: Iterable[Record]) -> Dict[str, List[Any]]:
+    """Разложить пакеты по столбцам для `calculate_batch`.
+
+    Столбец ``workout_types`` содержит коды тренировок, остальные —
+    параметры; поля, которых нет у типа тренировки, равны нулю.
+    """
+    columns: Dict[str, List[Any]] = {'workout_types': []}
+    columns.update((field, []) for field in BASE_FIELDS)
+    for count, (workout_type, data) in enumerate(records):
+        training_class = TRAINING_TYPES.get(workout_type)
+        if training_class is None:
+            raise ValueError('Неверные данные')
+        for field in training_class.EXTRA_FIELDS:
+            if field not in columns:
+                columns[field] = [0.0] * count
+        values = dict(zip(BASE_FIELDS + training_class.EXTRA_FIELDS, data))
+        columns['workout_types'].append(workout_type)
+        for field, column in columns.items():
+            if field != 'workout_types':
+                column.append(values.get(field, 0.0))
+    return columns
+
+
+def iter_trainings(records: Iterable[Record]) -> Iterator[Training]:
+    """Создать тренировки из пакетов через `read_package`."""
+    for workout_type, data in records:
+        yield read_package(workout_type, data)
+
+
+def iter_messages(trainings: Iterable[Training]) -> Iterator[InfoMessage]:
+    """Получить информационные сообщения о тренировках."""
+    for training in trainings:
+        yield training.show_training_info()
+
+
+def stream_file(path: Union[str, Path],
+                fmt: Optional[str] = None,
+                ) -> Iterator[InfoMessage]:
+    """Лениво получить сообщения о тренировках из файла пакетов."""
+    return iter_messages(iter_trainings(iter_records(path, fmt)))
@@ -2,10 +2,21 @@ import sys
 from pathlib import Path
 from io import StringIO
 
+import pytest
+
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
 
+@pytest.fixture
+def cache_counting():
+    import homework
+    homework.metrics_cache_counting()
+    homework.metrics_cache_reset()
+    yield
+    homework.metrics_cache_counting(False)
+
+
 class Capturing(list):
     """
     Class for capturing function stdout.
@@ -0,0 +1,64 @@
+import pytest
+
+import aggregation
+import homework
+
+DAY = aggregation.DAY
+
+
+def running(action):
+    return homework.Running(action, 1, 75)
+
+
+def test_stats():
+    stats = aggregation.Stats()
+    for value in (3.0, 1.0, 2.0):
+        stats.add(value)
+    assert (stats.count, stats.total, stats.minimum, stats.maximum) == (
+        3, 6.0, 1.0, 3.0)
+    assert stats.mean == 2.0
+
+
+def test_rolling_aggregator_query():
+    aggregator = aggregation.RollingAggregator(window=DAY, retention=7)
+    aggregator.add('anna', 0, running(15000))
+    aggregator.add('anna', DAY / 2, running(9000).show_training_info())
+    aggregator.add('anna', DAY + 1, running(12000))
+    aggregator.add('boris', 1, running(3000))
+
+    total = aggregator.query('anna', 'calories')
+    expected = [running(action).get_spent_calories()
+                for action in (15000, 9000, 12000)]
+    assert total.count == 3
+    assert total.total == pytest.approx(sum(expected))
+    assert total.maximum == max(expected), (
+        'Статистика должна учитывать все тренировки ключа.'
+    )
+    first_day = aggregator.query('anna', 'distance', start=0, end=DAY)
+    assert first_day.count == 2, (
+        'Запрос должен учитывать только окна из диапазона.'
+    )
+    assert aggregator.query('boris', 'calories').count == 1
+    assert sorted(aggregator.keys()) == ['anna', 'boris']
+
+
+def test_rolling_aggregator_expire():
+    aggregator = aggregation.RollingAggregator(window=DAY, retention=2)
+    aggregator.add('anna', 0, running(15000))
+    aggregator.add('anna', DAY, running(15000))
+    aggregator.add('anna', 2 * DAY, running(15000))
+    assert aggregator.query('anna', 'calories').count == 2, (
+        'Окна старше срока хранения должны удаляться.'
+    )
+    assert not aggregator.add('anna', 0, running(15000)), (
+        'Тренировки из удалённых окон должны отбрасываться.'
+    )
+    assert aggregator.add('anna', DAY + 5, running(15000))
+    assert aggregator.query('anna', 'calories').count == 3
+
+
+def test_rolling_aggregator_errors():
+    with pytest.raises(ValueError):
+        aggregation.RollingAggregator(window=0)
+    with pytest.raises(ValueError):
+        aggregation.RollingAggregator().query('anna', 'steps')
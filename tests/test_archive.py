@@ -0,0 +1,134 @@
+import io
+import random
+
+import pytest
+
+import archive
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+]
+
+
+def history(count, seed=5):
+    rnd = random.Random(seed)
+    athletes = [(rnd.uniform(50, 100), rnd.choice((170, 180.5)))
+                for _ in range(10)]
+    records = []
+    for _ in range(count):
+        weight, height = rnd.choice(athletes)
+        records.append(rnd.choice([
+            ('RUN', [rnd.randint(1000, 20000), rnd.uniform(0.5, 3), weight]),
+            ('WLK', [rnd.randint(1000, 20000), rnd.uniform(0.5, 3), weight,
+                     height]),
+            ('SWM', [rnd.randint(100, 2000), rnd.uniform(0.5, 3), weight,
+                     25, rnd.randint(1, 80)]),
+        ]))
+    return records
+
+
+def grouped(records):
+    return sorted(records, key=lambda record: record[0])
+
+
+@pytest.mark.parametrize('values', [
+    [1, 5, 3, -2 ** 40],
+    [75.5, 75.5, -0.0, 0.0, 80.25],
+    [float(index) for index in range(300)],
+    [2 ** 63, 1],
+])
+def test_column_round_trip(values):
+    data = archive.encode_column(values)
+    column, offset = archive.decode_column(memoryview(data), 0, len(values))
+    assert offset == len(data)
+    integers = all(value.__class__ is int and abs(value) < 2 ** 63
+                   for value in values)
+    assert [repr(value) for value in column] == [
+        repr(value if integers else float(value)) for value in values], (
+        'Столбец должен восстанавливаться без потерь.'
+    )
+
+
+def test_archive_records(tmp_path):
+    records = history(2000)
+    path = str(tmp_path / 'history.wkta')
+    archive.write_records(path, records, block_size=300)
+    with archive.ArchiveFile(path) as file:
+        assert len(file) == len(records)
+        assert {block.count for block in file.blocks} <= {300} | {
+            len([record for record in records if record[0] == code]) % 300
+            for code in ('RUN', 'WLK', 'SWM')}
+        decoded = list(file.records())
+        assert grouped(decoded) == grouped(records), (
+            'Из архива должны читаться те же пакеты, что были записаны.'
+        )
+        for position in (0, 299, 300, 1500, len(records) - 1):
+            assert file.record(position) == decoded[position], (
+                'Произвольный доступ должен совпадать с потоковым чтением.'
+            )
+        with pytest.raises(IndexError):
+            file.record(len(records))
+
+
+def test_archive_messages():
+    buffer = io.BytesIO()
+    archive.write_records(buffer, PACKAGES * 3, block_size=2)
+    buffer.seek(0)
+    with archive.ArchiveFile(buffer) as file:
+        messages = [info.get_message() for info in file.messages()]
+        expected = [homework.read_package(*record).show_training_info()
+                    .get_message() for record in file.records()]
+    assert messages == expected, (
+        'Расчёт по блокам архива должен совпадать с расчётом тренировок.'
+    )
+
+
+def test_archive_compresses_repeated_fields():
+    records = history(5000)
+    buffer = io.BytesIO()
+    archive.write_records(buffer, records)
+    raw = sum(8 * len(data) + 1 for _, data in records)
+    assert len(buffer.getvalue()) * 2 < raw, (
+        'Повторяющиеся параметры должны сжиматься.'
+    )
+
+
+def test_archive_bad_file(tmp_path):
+    path = tmp_path / 'history.wkta'
+    archive.write_records(str(path), PACKAGES)
+    content = path.read_bytes()
+    path.write_bytes(content[:-4])
+    with pytest.raises(ValueError):
+        archive.ArchiveFile(str(path))
+    path.write_bytes(b'XXXX' + content[4:])
+    with pytest.raises(ValueError):
+        archive.ArchiveFile(str(path))
+    header = archive.FILE_HEADER.size + sum(
+        1 + len(code) for code in homework.TRAINING_TYPES)
+    path.write_bytes(content[:header] + b'\0' * 8 + content[header + 8:])
+    with archive.ArchiveFile(str(path)) as file:
+        with pytest.raises(ValueError):
+            list(file.records())
+
+
+def test_archive_bad_package():
+    with archive.ArchiveWriter(io.BytesIO()) as writer:
+        with pytest.raises(ValueError):
+            writer.write('RUN', [1, 1])
+        with pytest.raises(ValueError):
+            writer.write('XXX', [1, 1, 1])
+
+
+def test_cli_reads_archive(tmp_path):
+    path = str(tmp_path / 'history.wkta')
+    archive.write_records(path, PACKAGES)
+    out = io.StringIO()
+    assert homework.run_cli(['-f', path], stdout=out) == 0
+    assert sorted(out.getvalue().splitlines()) == sorted(
+        homework.read_package(*record).show_training_info().get_message()
+        for record in PACKAGES)
@@ -0,0 +1,47 @@
+import benchmarks
+
+
+def test_generate_packages_is_reproducible():
+    assert benchmarks.generate_packages(20) == (
+        benchmarks.generate_packages(20)
+    ), 'Наборы данных для замеров должны быть воспроизводимыми.'
+
+
+def test_run_suite(tmp_path):
+    report = benchmarks.run_suite(sizes=(1, 10), repeat=1)
+    for name in ('read_package', 'get_message', 'main', 'calculate_batch',
+                 'Running.get_spent_calories', 'Swimming.get_mean_speed',
+                 'cached_show_training_info', 'archive_write',
+                 'archive_read', 'AthleteIndex.calculate',
+                 'AthleteIndex.scalar'):
+        assert f'{name}[10]' in report['results'], (
+            f'Набор замеров должен содержать `{name}`.'
+        )
+    assert report['compression']['10'] > 0, (
+        'Отчёт должен содержать степень сжатия архива.'
+    )
+    assert report['import_ms'] > 0, 'Отчёт должен содержать время импорта.'
+    path = str(tmp_path / 'results.json')
+    benchmarks.save_results(report, path)
+    assert benchmarks.load_results(path) == report
+
+
+def test_compare():
+    baseline = {'results': {'main[10]': {'ns_per_record': 100.0},
+                            'get_message[10]': {'ns_per_record': 100.0}}}
+    current = {'results': {'main[10]': {'ns_per_record': 150.0},
+                           'get_message[10]': {'ns_per_record': 105.0},
+                           'new[10]': {'ns_per_record': 1.0}}}
+    assert benchmarks.compare(baseline, current, threshold=0.1) == [
+        ('main[10]', 100.0, 150.0)
+    ], 'Сравнение должно находить только замедлившиеся замеры.'
+
+
+def test_run_exit_code(tmp_path, capsys):
+    path = str(tmp_path / 'results.json')
+    assert benchmarks.run(['--sizes', '10', '--repeat', '1',
+                           '--only', 'main', '--output', path]) == 0
+    assert benchmarks.run(['--sizes', '10', '--repeat', '1',
+                           '--only', 'main', '--compare', path,
+                           '--threshold', '1000']) == 0
+    assert 'main[10]' in capsys.readouterr().out
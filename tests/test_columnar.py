@@ -0,0 +1,130 @@
+import pytest
+
+import columnar
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / 'workouts.wktc')
+    columnar.write_records(path, iter(PACKAGES), block_size=2)
+    return path
+
+
+def test_columnar_records(path):
+    with columnar.ColumnarFile(path) as file:
+        assert len(file) == len(PACKAGES)
+        assert len(file.blocks) == 3, (
+            'Записи должны делиться на блоки по `block_size`.'
+        )
+        assert list(file.records()) == PACKAGES, (
+            'Из файла должны читаться те же пакеты, что были записаны.'
+        )
+
+
+def test_columnar_calculate(path):
+    with columnar.ColumnarFile(path) as file:
+        assert isinstance(file.blocks[0].columns['action'], memoryview)
+        calories = [value for result in file.calculate()
+                    for value in result.calories]
+    assert calories == [
+        homework.read_package(*package).get_spent_calories()
+        for package in PACKAGES
+    ], 'Расчёт по столбцам файла должен совпадать с расчётом тренировок.'
+
+
+def test_columnar_bad_file(tmp_path, path):
+    with open(path, 'rb') as file:
+        content = file.read()
+    broken = tmp_path / 'broken.wktc'
+    broken.write_bytes(content[:-8])
+    with pytest.raises(ValueError):
+        columnar.ColumnarFile(str(broken))
+    broken.write_bytes(b'XXXX' + content[4:])
+    with pytest.raises(ValueError):
+        columnar.ColumnarFile(str(broken))
+
+
+def header_size():
+    size = columnar.FILE_HEADER.size + sum(
+        1 + len(code.encode('utf-8')) for code in homework.TRAINING_TYPES)
+    return size, size + columnar._padding(size)
+
+
+@pytest.mark.parametrize('cut', [
+    lambda table, padded: 0,
+    lambda table, padded: 3,
+    lambda table, padded: columnar.FILE_HEADER.size + 2,
+    lambda table, padded: table,
+    lambda table, padded: padded + 4,
+])
+def test_columnar_truncated_file(tmp_path, path, cut):
+    with open(path, 'rb') as file:
+        content = file.read()
+    broken = tmp_path / 'broken.wktc'
+    broken.write_bytes(content[:cut(*header_size())])
+    with pytest.raises(ValueError):
+        columnar.ColumnarFile(str(broken))
+
+
+def test_columnar_empty_records(tmp_path):
+    path = str(tmp_path / 'empty.wktc')
+    columnar.write_records(path, iter([]))
+    with columnar.ColumnarFile(path) as file:
+        assert len(file) == 0
+        assert list(file.records()) == []
+
+
+def test_columnar_bad_package(tmp_path):
+    path = str(tmp_path / 'workouts.wktc')
+    with columnar.ColumnarWriter(path) as writer:
+        with pytest.raises(ValueError):
+            writer.write('RUN', [1, 1])
+        with pytest.raises(ValueError):
+            writer.write('XXX', [1, 1, 1])
+        writer.write(*PACKAGES[1])
+        with pytest.raises(ValueError):
+            writer.write('RUN', [1, 1, 'x'])
+        writer.write(*PACKAGES[3])
+    with columnar.ColumnarFile(path) as file:
+        assert list(file.records()) == [PACKAGES[1], PACKAGES[3]], (
+            'Неверный пакет не должен портить столбцы блока.'
+        )
+
+
+class Rowing(homework.Training):
+    """Тренировка с параметром, которого нет в столбцах файла."""
+
+    EXTRA_FIELDS = ('resistance',)
+
+    def __init__(self, action, duration, weight, resistance):
+        super().__init__(action, duration, weight)
+        self.resistance = resistance
+
+
+@pytest.fixture
+def rowing():
+    homework.register_training('ROW')(Rowing)
+    yield Rowing
+    homework.unregister_training('ROW')
+
+
+def test_columnar_unsupported_type(tmp_path, rowing):
+    path = str(tmp_path / 'workouts.wktc')
+    with columnar.ColumnarWriter(path) as writer:
+        assert 'ROW' not in writer.codes
+        with pytest.raises(ValueError, match='ROW'):
+            writer.write('ROW', [1000, 2, 80, 3])
+        writer.write(*PACKAGES[0])
+    with columnar.ColumnarFile(path) as file:
+        assert list(file.records()) == [PACKAGES[0]], (
+            'Тренировку с параметрами не из COLUMNS нельзя записать в файл.'
+        )
@@ -0,0 +1,68 @@
+import pytest
+
+import differential
+import homework
+import validation
+
+
+def test_generate_records():
+    records = differential.generate_records(500, seed=1)
+    assert records == differential.generate_records(500, seed=1), (
+        'Случайные пакеты должны быть воспроизводимыми.'
+    )
+    assert {workout_type for workout_type, _ in records} == set(
+        homework.TRAINING_TYPES), 'Должны генерироваться пакеты всех типов.'
+    assert all(validation.validate_package(*record) is None
+               for record in records), 'Пакеты должны быть корректными.'
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_engines_match_reference(seed):
+    report = differential.run_harness(count=400, seed=seed)
+    assert set(report['engines']) == {'scalar', *differential.ENGINES}
+    for name, result in report['engines'].items():
+        assert result['mismatches'] == 0, (
+            f'Способ {name} расходится с эталоном: {result["examples"]}'
+        )
+
+
+def test_harness_finds_mismatches(monkeypatch):
+    def true_division(records):
+        messages = differential.scalar(records)
+        for info, (workout_type, data) in zip(messages, records):
+            if workout_type == 'WLK':
+                action, duration, weight, height = data
+                speed = info.speed
+                info.calories = ((0.035 * weight + (speed ** 2 / height)
+                                  * 0.029 * weight) * duration * 60)
+        return messages
+
+    def broken(records):
+        raise ZeroDivisionError
+
+    monkeypatch.setattr(differential, 'ENGINES',
+                        {'true_division': true_division, 'broken': broken})
+    report = differential.run_harness(count=200, seed=3)
+    assert report['engines']['true_division']['mismatches'] > 0, (
+        'Сверка должна замечать отличие от целочисленного деления.'
+    )
+    assert report['engines']['broken']['mismatches'] == 1
+    assert 'ZeroDivisionError' in (
+        report['engines']['broken']['examples'][0]['error'])
+
+
+def test_fingerprint_distinguishes_negative_zero():
+    info = homework.InfoMessage('Running', 1, 0.0, 0.0, 0.0)
+    negative = homework.InfoMessage('Running', 1, -0.0, 0.0, 0.0)
+    assert differential.fingerprint(info) != differential.fingerprint(
+        negative)
+    assert differential.fingerprint(info) == differential.fingerprint(
+        homework.InfoMessage('Running', 1.0, 0.0, 0.0, 0.0))
+
+
+def test_run_exit_code(tmp_path, capsys):
+    path = str(tmp_path / 'report.json')
+    assert differential.run(['--count', '50', '--engines', 'batch',
+                             'cached', '--output', path]) == 0
+    out = capsys.readouterr().out
+    assert 'batch:' in out and 'parallel:' not in out
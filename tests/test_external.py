@@ -0,0 +1,123 @@
+import random
+import tracemalloc
+
+import pytest
+
+import aggregation
+import external
+import homework
+
+CALORIES = external.FIELDS.index('calories')
+
+
+def make_rows(count, seed=1):
+    rnd = random.Random(seed)
+    workout_types = [rnd.choice(['RUN', 'WLK']) for _ in range(count)]
+    action = [rnd.randint(1, 20000) for _ in range(count)]
+    duration = [rnd.randint(1, 5) for _ in range(count)]
+    weight = [rnd.randint(40, 120) for _ in range(count)]
+    height = [rnd.randint(150, 200) for _ in range(count)]
+    result = homework.calculate_batch(workout_types, action, duration,
+                                      weight, height=height)
+    return list(external.batch_rows(workout_types, duration, result))
+
+
+def calories(row):
+    return row[CALORIES]
+
+
+def test_batch_rows():
+    result = homework.calculate_batch(['RUN'], [9000], [1], [75])
+    info = homework.Running(9000, 1, 75).show_training_info()
+    assert list(external.batch_rows(['RUN'], [1], result)) == [
+        (info.training_type, info.duration, info.distance, info.speed,
+         info.calories)]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_external_sort_spills(tmp_path, reverse):
+    rows = make_rows(5000)
+    sorter = external.ExternalSorter(key=calories, reverse=reverse,
+                                     max_rows=100, fan_in=4,
+                                     tmpdir=str(tmp_path))
+    assert list(sorter.sort(rows)) == sorted(
+        rows, key=calories, reverse=reverse), (
+        'Внешняя сортировка должна совпадать с sorted')
+    assert sorter.runs == 50, 'Серии должны сбрасываться на диск'
+    assert not list(tmp_path.iterdir()), 'Временные файлы должны удаляться'
+
+
+def test_external_sort_in_memory():
+    sorter = external.ExternalSorter(max_rows=10)
+    assert list(sorter.sort([3, 1, 2])) == [1, 2, 3]
+    assert list(sorter.sort([])) == []
+    assert sorter.runs == 0
+    assert list(external.external_sort(range(25), max_rows=10,
+                                       reverse=True)) == list(
+        range(24, -1, -1))
+
+
+def test_group_by(tmp_path):
+    rows = make_rows(3000)
+
+    def key(row):
+        return row[0], int(row[1])
+
+    expected = {}
+    for row in rows:
+        expected.setdefault(key(row), aggregation.Stats()).add(calories(row))
+    groups = list(external.group_by(rows, key, calories, max_rows=3,
+                                    fan_in=2, tmpdir=str(tmp_path)))
+    assert [group for group, _ in groups] == sorted(expected), (
+        'Группы должны идти в порядке ключей')
+    for group, stats in groups:
+        assert stats.count == expected[group].count
+        assert stats.minimum == expected[group].minimum
+        assert stats.maximum == expected[group].maximum
+        assert stats.total == pytest.approx(expected[group].total)
+
+
+def test_top_k():
+    rows = make_rows(1000)
+    assert external.top_k(rows, 5, key=calories) == sorted(
+        rows, key=calories, reverse=True)[:5]
+    assert external.top_k(rows, 5, key=calories, smallest=True) == sorted(
+        rows, key=calories)[:5]
+
+
+def test_external_sort_bounded_memory():
+    def rows():
+        for index in range(200000):
+            yield (index * 7919 % 200000, 'x' * 20)
+
+    tracemalloc.start()
+    try:
+        sorter = external.ExternalSorter(max_rows=2000, fan_in=16)
+        previous = -1
+        for value, _ in sorter.sort(rows()):
+            assert value > previous
+            previous = value
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert previous == 199999
+    assert peak < 8 * 1024 * 1024, (
+        'Память сортировки не должна расти с длиной потока')
+
+
+def test_external_sort_block_rows(monkeypatch, tmp_path):
+    sizes = []
+    dump = external.pickle.dump
+
+    def recording_dump(block, *args):
+        sizes.append(len(block))
+        dump(block, *args)
+
+    monkeypatch.setattr(external.pickle, 'dump', recording_dump)
+    sorter = external.ExternalSorter(max_rows=100, fan_in=4,
+                                     tmpdir=str(tmp_path))
+    assert list(sorter.sort(range(999, -1, -1))) == list(range(1000))
+    assert max(sizes) == 25, (
+        'Блоки серий должны быть не больше max_rows // fan_in строк, '
+        'чтобы слияние держало в памяти около max_rows строк'
+    )
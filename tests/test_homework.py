@@ -1,8 +1,15 @@
+import copy
+import io
+import json
+import pickle
 import re
+import subprocess
+import sys
+import threading
 import pytest
 import types
 import inspect
-from conftest import Capturing
+from conftest import BASE_DIR, Capturing
 
 try:
     import homework
@@ -363,3 +370,317 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+]
+
+
+def to_columns(packages):
+    columns = {field: [] for field in (
+        'action', 'duration', 'weight',
+        'height', 'length_pool', 'count_pool')}
+    for workout_type, data in packages:
+        training_class = homework.TRAINING_TYPES[workout_type]
+        fields = ['action', 'duration', 'weight'] + list(
+            training_class.EXTRA_FIELDS)
+        values = dict(zip(fields, data))
+        for field, column in columns.items():
+            column.append(values.get(field, 0))
+    return [workout_type for workout_type, _ in packages], columns
+
+
+@pytest.mark.parametrize('packages', [
+    PACKAGES,
+    [package for package in PACKAGES if package[0] == 'RUN'],
+])
+def test_calculate_batch(packages):
+    workout_types, columns = to_columns(packages)
+    result = homework.calculate_batch(workout_types, **columns)
+    for index, (workout_type, data) in enumerate(packages):
+        training = homework.read_package(workout_type, data)
+        assert result.distance[index] == training.get_distance(), (
+            'Пакетный расчёт дистанции должен совпадать с `get_distance`.'
+        )
+        assert result.speed[index] == training.get_mean_speed(), (
+            'Пакетный расчёт скорости должен совпадать с `get_mean_speed`.'
+        )
+        assert result.calories[index] == training.get_spent_calories(), (
+            'Пакетный расчёт калорий должен совпадать '
+            'с `get_spent_calories`.'
+        )
+
+
+def test_calculate_batch_unknown_type():
+    with pytest.raises(ValueError):
+        homework.calculate_batch(['XXX'], [1], [1], [1])
+
+
+@pytest.mark.parametrize('workout_types, columns', [
+    (['RUN', 'RUN'], {'action': [9000], 'duration': [1, 1],
+                      'weight': [75, 75]}),
+    (['RUN', 'WLK'], {'action': [9000], 'duration': [1, 1],
+                      'weight': [75, 75], 'height': [0, 180]}),
+    (['WLK'], {'action': [9000], 'duration': [1], 'weight': [75]}),
+    (['SWM'], {'action': [720], 'duration': [1], 'weight': [80],
+               'length_pool': [25], 'count_pool': []}),
+])
+def test_calculate_batch_bad_columns(workout_types, columns):
+    with pytest.raises(ValueError):
+        homework.calculate_batch(workout_types, **columns)
+
+
+@pytest.mark.parametrize('cache', [False, True])
+@pytest.mark.parametrize('binary', [False, True])
+def test_render_many(cache, binary):
+    messages = [
+        homework.read_package(workout_type, data).show_training_info()
+        for workout_type, data in PACKAGES * 3
+    ] + [homework.InfoMessage('Running', 1, 0.0, 0.0, -0.0)]
+    out = io.BytesIO() if binary else io.StringIO()
+    count = homework.render_many(messages, out, cache=cache, buffer_size=4)
+    result = out.getvalue()
+    if binary:
+        result = result.decode('utf-8')
+    assert count == len(messages)
+    assert result.splitlines() == [
+        info.get_message() for info in messages
+    ], (
+        '`render_many` должен записывать те же строки, '
+        'что возвращает `get_message`.'
+    )
+    assert result.splitlines()[-1].endswith('Потрачено ккал: -0.000.')
+
+
+@pytest.mark.parametrize('workout_type, data, field, value', [
+    ('RUN', [15000, 1, 75], 'duration', 2),
+    ('WLK', [9000, 1, 75, 180], 'height', 150),
+    ('SWM', [720, 1, 80, 25, 40], 'length_pool', 50),
+])
+def test_metrics_cache(cache_counting, workout_type, data, field, value):
+    training = homework.read_package(workout_type, data).enable_cache()
+    homework.metrics_cache_reset()
+    expected = homework.read_package(workout_type, data)
+    assert training.show_training_info() == expected.show_training_info()
+    assert training.__class__.__name__ == expected.__class__.__name__
+    misses = homework.metrics_cache_info().misses
+    training.show_training_info()
+    info = homework.metrics_cache_info()
+    assert info.misses == misses and info.hits > 0, (
+        'Повторный расчёт показателей должен брать значения из кэша.'
+    )
+
+    setattr(training, field, value)
+    setattr(expected, field, value)
+    assert training.show_training_info() == expected.show_training_info(), (
+        'Изменение атрибута тренировки должно сбрасывать кэш показателей.'
+    )
+    training.disable_cache()
+    assert type(training) is type(expected)
+    homework.metrics_cache_counting(False)
+    hits = homework.metrics_cache_info().hits
+    training.enable_cache().show_training_info()
+    training.show_training_info()
+    assert homework.metrics_cache_info().hits == hits, (
+        'Без подсчёта попадания кэша не должны считаться.'
+    )
+    cached_class = type(training.enable_cache())
+    assert type(training.enable_cache()) is cached_class, (
+        'Повторное включение кэша не должно создавать новый класс.'
+    )
+    assert type(expected.disable_cache()) is type(training.disable_cache())
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40]),
+])
+def test_metrics_cache_pickle(workout_type, data):
+    training = homework.read_package(workout_type, data).enable_cache()
+    training.comment = 'утро'
+    training.show_training_info()
+    for restored in (pickle.loads(pickle.dumps(training)),
+                     copy.deepcopy(training)):
+        assert type(restored) is type(training), (
+            'После восстановления кэш показателей должен быть включён.'
+        )
+        assert restored.comment == 'утро'
+        assert '_metrics' not in restored.__dict__
+        assert restored.show_training_info() == (
+            homework.read_package(workout_type, data).show_training_info())
+
+
+def test_metrics_cache_threads(cache_counting):
+    training = homework.Running(15000, 1, 75).enable_cache()
+    training.get_distance()
+    homework.metrics_cache_reset()
+
+    def calculate():
+        for _ in range(100):
+            training.get_distance()
+
+    threads = [threading.Thread(target=calculate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert homework.metrics_cache_info() == (400, 0), (
+        'Счётчики потоков должны складываться в общий итог.'
+    )
+    assert len(homework._STATS_COUNTS) <= 2, (
+        'Счётчики завершённых потоков должны удаляться.'
+    )
+
+
+class Rowing(homework.Training):
+    """Тренировка для проверки реестра: гребля."""
+
+    LEN_STEP = 8.0
+    EXTRA_FIELDS = ('resistance',)
+
+    def __init__(self, action, duration, weight, resistance):
+        super().__init__(action, duration, weight)
+        self.resistance = resistance
+
+    def get_spent_calories(self):
+        return self.get_mean_speed() * self.resistance * self.weight
+
+
+@pytest.fixture
+def rowing():
+    homework.register_training('ROW')(Rowing)
+    yield Rowing
+    homework.unregister_training('ROW')
+
+
+def test_register_training(rowing):
+    training = homework.read_package('ROW', [1000, 2, 80, 3])
+    assert isinstance(training, Rowing), (
+        '`read_package` должен создавать зарегистрированные тренировки.'
+    )
+    assert homework.TRAINING_ARITY['ROW'] == 4
+    result = homework.calculate_batch(
+        ['ROW', 'RUN'], [1000, 15000], [2, 1], [80, 75], resistance=[3, 0])
+    assert list(result.calories) == [
+        training.get_spent_calories(),
+        homework.Running(15000, 1, 75).get_spent_calories(),
+    ], 'Пакетный расчёт должен поддерживать зарегистрированные тренировки.'
+
+
+def test_register_training_errors(rowing):
+    with pytest.raises(ValueError):
+        homework.register_training('ROW')(Rowing)
+
+    class BadFields(Rowing):
+        EXTRA_FIELDS = ('height',)
+
+    with pytest.raises(TypeError):
+        homework.register_training('BAD')(BadFields)
+    assert 'BAD' not in homework.TRAINING_TYPES
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1]),
+    ('SWM', [720, 1, 80, 25]),
+    ('XXX', [1, 1, 1]),
+])
+def test_read_package_bad_data(workout_type, data):
+    with pytest.raises(ValueError):
+        homework.read_package(workout_type, data)
+
+
+HEAVY_MODULES = ('argparse', 'asyncio', 'concurrent.futures', 'csv', 'json',
+                 'mmap', 'multiprocessing', 'sqlite3', 'columnar', 'parallel',
+                 'server', 'streaming', 'validation')
+
+
+def test_run_cli_arguments():
+    out, err = io.StringIO(), io.StringIO()
+    assert homework.run_cli(['RUN:15000,1,75', 'WLK:9000,1,75,180'],
+                            stdout=out, stderr=err) == 0
+    assert out.getvalue().splitlines() == [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in (('RUN', [15000, 1, 75]), ('WLK', [9000, 1, 75, 180]))
+    ], 'Командная строка должна печатать сообщения о пакетах из аргументов.'
+
+
+def test_run_cli_stdin_and_validate():
+    stdin = io.StringIO('SWM,720,1,80,25,40\nRUN,1,0,1\n')
+    out, err = io.StringIO(), io.StringIO()
+    assert homework.run_cli(['--validate'], stdin=stdin, stdout=out,
+                            stderr=err) == 0
+    assert out.getvalue().startswith('Тип тренировки: Swimming;')
+    assert 'zero_divisor' in err.getvalue()
+
+    stdin = io.StringIO('RUN,1,0,1\n')
+    assert homework.run_cli([], stdin=stdin, stdout=out, stderr=err) == 1, (
+        'Ошибочный пакет без проверки должен завершать программу с ошибкой.'
+    )
+
+
+@pytest.mark.parametrize('fmt, text', [
+    ('csv', 'RUN,abc,1,75\nRUN,15000,1,75\n'),
+    ('jsonl', '["RUN", [1\n{"data": [1]}\n5\n["RUN", [15000, 1, 75]]\n'),
+])
+def test_run_cli_validate_parse_errors(fmt, text):
+    out, err = io.StringIO(), io.StringIO()
+    assert homework.run_cli(['--validate', '--format', fmt, 'RUN:1,x,1'],
+                            stdin=io.StringIO(text), stdout=out,
+                            stderr=err) == 0
+    assert homework.run_cli(['--validate', '--format', fmt, '-f', '-'],
+                            stdin=io.StringIO(text), stdout=out,
+                            stderr=err) == 0, (
+        'С --validate неразобранные строки не должны останавливать расчёт.'
+    )
+    assert out.getvalue() == homework.Running(
+        15000, 1, 75).show_training_info().get_message() + '\n'
+    reports = [json.loads(line) for line in err.getvalue().splitlines()]
+    assert [report['reason'] for report in reports] == (
+        ['parse_error'] * len(reports))
+    assert reports[0]['line'] == 'RUN:1,x,1'
+    assert len(reports) == len(text.splitlines())
+
+
+def test_run_cli_keeps_output_before_error():
+    stdin = io.StringIO('RUN,15000,1,75\nWLK,9000,1,75,180\nRUN,1,0,1\n')
+    out, err = io.StringIO(), io.StringIO()
+    assert homework.run_cli([], stdin=stdin, stdout=out, stderr=err) == 1
+    assert len(out.getvalue().splitlines()) == 2, (
+        'Сообщения до ошибочного пакета должны быть напечатаны.'
+    )
+    assert err.getvalue().startswith('Ошибка:')
+
+
+@pytest.mark.parametrize('argv, text', [
+    (['-f', '/nonexistent.csv'], ''),
+    (['--format', 'jsonl'], '{"workout_type": "RUN"}\n'),
+    (['--format', 'jsonl'], '["WLK", [1e200, 1e-10, 1, 1]]\n'),
+])
+def test_run_cli_reports_errors(argv, text):
+    out, err = io.StringIO(), io.StringIO()
+    assert homework.run_cli(argv, stdin=io.StringIO(text), stdout=out,
+                            stderr=err) == 1
+    assert err.getvalue().startswith('Ошибка:'), (
+        'Ошибки чтения и расчёта должны выводиться без трассировки.'
+    )
+
+
+def test_import_is_lightweight():
+    code = (
+        'import sys\n'
+        'import homework\n'
+        f'print([name for name in {HEAVY_MODULES!r} if name in sys.modules])'
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip()
+    assert loaded == '[]', (
+        f'Импорт `homework` не должен загружать модули {loaded}.'
+    )
@@ -0,0 +1,122 @@
+import threading
+import urllib.request
+
+import pytest
+from conftest import Capturing
+
+import homework
+import instrumentation
+
+
+@pytest.fixture
+def metrics():
+    metrics = instrumentation.Instrumentation()
+    yield metrics
+    metrics.disable()
+
+
+def test_disabled_by_default():
+    assert not instrumentation.INSTRUMENTATION.enabled
+    assert not hasattr(homework.read_package, '__wrapped__'), (
+        'Без включения замеров функции модуля не должны подменяться.'
+    )
+
+
+def test_instrumentation_and_metric_cache(metrics):
+    homework.Running(15000, 1, 75).enable_cache()
+    metrics.enable()
+    homework.Running(15000, 1, 75).enable_cache().get_spent_calories()
+    histogram = metrics.histograms['Running.get_spent_calories']
+    assert histogram.count == 1, (
+        'Промах кэша показателей должен попадать в замеры.'
+    )
+    metrics.disable()
+    homework.Swimming(720, 1, 80, 25, 40).enable_cache()
+    homework.Running(15000, 1, 75).enable_cache().get_spent_calories()
+    assert histogram.count == 1, (
+        'После выключения замеров кэш не должен вызывать обёртки.'
+    )
+
+
+def test_instrumentation_counts(metrics):
+    read_package = homework.read_package
+    get_message = homework.InfoMessage.get_message
+    metrics.enable()
+    with Capturing() as output:
+        homework.main(homework.read_package('RUN', [15000, 1, 75]))
+    with pytest.raises(ValueError):
+        homework.read_package('XXX', [1, 1, 1])
+    assert len(output) == 1
+    histograms = metrics.histograms
+    assert histograms['read_package'].count == 2
+    assert histograms['read_package'].errors == 1
+    assert histograms['main'].count == 1
+    assert histograms['Training.show_training_info'].count == 1
+    assert histograms['Running.get_spent_calories'].count == 1
+    assert histograms['Training.get_distance'].count == 3, (
+        'Замеры должны учитывать каждый вызов метода.'
+    )
+    assert histograms['InfoMessage.get_message'].count == 1
+
+    metrics.disable()
+    assert homework.read_package is read_package
+    assert homework.InfoMessage.get_message is get_message, (
+        'После выключения замеров должны вернуться исходные функции.'
+    )
+
+
+def test_instrumentation_sampler(metrics):
+    calls = []
+
+    def sampler(name, call):
+        calls.append(name)
+        return call()
+
+    metrics.enable(sample_every=2, sampler=sampler)
+    for _ in range(4):
+        homework.read_package('RUN', [15000, 1, 75])
+    assert calls.count('read_package') == 2, (
+        'Сэмплер должен получать каждый `sample_every`-й вызов.'
+    )
+    profile = instrumentation.ProfileSampler()
+    assert profile('read_package', lambda: 5) == 5
+
+
+def test_export_prometheus(metrics, tmp_path):
+    metrics.enable()
+    homework.read_package('RUN', [15000, 1, 75])
+    text = metrics.export_prometheus()
+    assert 'fitness_calls_total{function="read_package"} 1' in text
+    assert ('fitness_latency_seconds_bucket{function="read_package",'
+            'le="+Inf"} 1') in text
+    path = tmp_path / 'metrics.prom'
+    metrics.write_prometheus(str(path))
+    assert path.read_text(encoding='utf-8') == text
+    server = metrics.serve_prometheus(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/') as response:
+            assert response.read().decode('utf-8') == text
+    finally:
+        server.shutdown()
+        server.server_close()
+    metrics.reset()
+    assert metrics.histograms['read_package'].count == 0
+
+
+def test_histogram_reset_keeps_lock():
+    histogram = instrumentation.Histogram()
+    lock = histogram.lock
+    threads = [threading.Thread(target=lambda: [
+        histogram.observe(1e-6) for _ in range(2000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    histogram.reset()
+    for thread in threads:
+        thread.join()
+    assert histogram.lock is lock, (
+        'Сброс не должен заменять блокировку гистограммы.'
+    )
+    assert sum(histogram.counts) == histogram.count, (
+        'Сброс во время замеров не должен рассогласовывать счётчики.'
+    )
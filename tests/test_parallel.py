@@ -0,0 +1,150 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import external
+import homework
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+] * 7
+
+
+def test_chunked():
+    chunks = list(parallel.chunked(range(7), 3))
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]], (
+        'Поток пакетов должен разбиваться на части заданного размера.'
+    )
+
+
+@pytest.mark.parametrize('chunk_size, max_pending', [(1, 1), (4, 2), (50, 3)])
+def test_process_parallel_keeps_order(chunk_size, max_pending):
+    result = list(parallel.process_parallel(
+        PACKAGES, workers=2, chunk_size=chunk_size, max_pending=max_pending))
+    expected = [
+        homework.read_package(workout_type, data).show_training_info()
+        for workout_type, data in PACKAGES
+    ]
+    assert result == expected, (
+        'Параллельный расчёт должен возвращать сообщения в исходном порядке.'
+    )
+
+
+def test_process_parallel_error():
+    packages = PACKAGES[:3] + [('XXX', [1, 1, 1])] + PACKAGES
+    with pytest.raises(ValueError):
+        list(parallel.process_parallel(packages, workers=2, chunk_size=2))
+
+
+def test_process_parallel_bad_chunk_size():
+    with pytest.raises(ValueError):
+        list(parallel.process_parallel(PACKAGES, chunk_size=0))
+
+
+def make_columns(count):
+    rnd = random.Random(count)
+    return {
+        'workout_types': [rnd.choice(['RUN', 'WLK', 'SWM'])
+                          for _ in range(count)],
+        'action': [rnd.randint(1, 20000) for _ in range(count)],
+        'duration': [rnd.uniform(0.1, 5) for _ in range(count)],
+        'weight': [rnd.uniform(40, 120) for _ in range(count)],
+        'height': [rnd.uniform(150, 200) for _ in range(count)],
+        'length_pool': [rnd.randint(10, 50) for _ in range(count)],
+        'count_pool': [rnd.randint(1, 80) for _ in range(count)],
+    }
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000, 100000])
+def test_calculate_batch_threaded(chunk_size):
+    columns = make_columns(3000)
+    expected = homework.calculate_batch(**columns)
+    result = parallel.calculate_batch_threaded(
+        workers=4, chunk_size=chunk_size, **columns)
+    assert result == expected, (
+        'Расчёт в пуле потоков должен совпадать с calculate_batch.'
+    )
+    with ThreadPoolExecutor(2) as executor:
+        assert parallel.calculate_batch_threaded(
+            executor=executor, chunk_size=chunk_size, **columns) == expected
+
+
+def test_calculate_batch_threaded_error():
+    columns = make_columns(100)
+    columns['workout_types'][57] = 'XXX'
+    with pytest.raises(ValueError):
+        parallel.calculate_batch_threaded(chunk_size=10, **columns)
+
+
+def test_concurrent_stress(cache_counting):
+    columns = make_columns(2000)
+    batch = homework.calculate_batch(**columns)
+    packages = PACKAGES * 20
+    messages = [homework.read_package(workout_type, data)
+                .show_training_info().get_message()
+                for workout_type, data in packages]
+    shared = [homework.read_package(workout_type, data).enable_cache()
+              for workout_type, data in packages]
+    for training in shared:
+        training.show_training_info()
+    homework.metrics_cache_reset()
+    for training in shared:
+        training.show_training_info()
+    per_pass = sum(homework.metrics_cache_info())
+    threads = 8
+    barrier = threading.Barrier(threads + 1)
+    homework.metrics_cache_reset()
+
+    class Temporary(homework.Running):
+        __slots__ = ()
+
+    def calculate():
+        barrier.wait()
+        results = []
+        for _ in range(5):
+            results.append([homework.read_package(workout_type, data)
+                            .show_training_info().get_message()
+                            for workout_type, data in packages])
+            results.append([training.show_training_info().get_message()
+                            for training in shared])
+            results.append(homework.calculate_batch(**columns))
+            results.append(list(homework.iter_batch_messages(
+                columns['workout_types'], columns['duration'], batch)))
+            results.append(list(external.batch_rows(
+                columns['workout_types'], columns['duration'], batch)))
+        return results
+
+    def register():
+        barrier.wait()
+        for _ in range(2000):
+            homework.register_training('TMP')(Temporary)
+            homework.unregister_training('TMP')
+
+    with ThreadPoolExecutor(threads + 1) as executor:
+        futures = [executor.submit(calculate) for _ in range(threads)]
+        registering = executor.submit(register)
+        results = [future.result() for future in futures]
+        registering.result()
+
+    batch_messages = list(homework.iter_batch_messages(
+        columns['workout_types'], columns['duration'], batch))
+    rows = list(external.batch_rows(
+        columns['workout_types'], columns['duration'], batch))
+    for thread_results in results:
+        for index, result in enumerate(thread_results):
+            expected = (messages, messages, batch, batch_messages,
+                        rows)[index % 5]
+            assert result == expected, (
+                'Результаты расчёта в потоках должны быть детерминированы.'
+            )
+    assert sum(homework.metrics_cache_info()) == threads * 5 * per_pass, (
+        'Счётчики кэша не должны терять обращения.'
+    )
+    assert 'TMP' not in homework.TRAINING_TYPES
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import homework
+import profiles
+
+
+def history(count, seed=7):
+    rnd = random.Random(seed)
+    athletes = [(rnd.uniform(40, 120), rnd.uniform(150, 200),
+                 rnd.choice((25, 50))) for _ in range(20)]
+    records = []
+    for _ in range(count):
+        weight, height, pool = rnd.choice(athletes)
+        action, duration = rnd.randint(1, 20000), rnd.uniform(0.1, 5)
+        records.append(rnd.choice([
+            ('RUN', [action, duration, weight]),
+            ('WLK', [action, duration, weight, height]),
+            ('SWM', [action, duration, weight, pool, rnd.randint(1, 80)]),
+        ]))
+    return records
+
+
+def fields(info):
+    return tuple(repr(getattr(info, name)) for name in info.__slots__)
+
+
+def test_athlete_index_matches_formulas():
+    records = history(3000) + [
+        ('RUN', [1206, 12, 6]), ('WLK', [420, 4, 20, 42]),
+        ('SWM', [720, 1, 80, 25, 40]), ('RUN', [0, 1, -0.0]),
+        ('RUN', [0, 1, 0.0]), ('SWM', [720, 1, -0.0, 25, 40])]
+    index = profiles.AthleteIndex()
+    result = list(index.calculate_many(records))
+    expected = [homework.read_package(*record).show_training_info()
+                for record in records]
+    assert [fields(info) for info in result] == [
+        fields(info) for info in expected], (
+        'Расчёт по таблице спортсменов должен совпадать с формулами бит в бит.'
+    )
+    assert index.hits > index.misses, (
+        'Множители спортсмена должны считаться один раз.'
+    )
+
+
+def test_athlete_index_limits_size():
+    index = profiles.AthleteIndex(maxsize=10)
+    for weight in range(1, 50):
+        index.calculate('RUN', [1000, 1, weight])
+    assert len(index) <= 10
+
+
+def test_athlete_index_errors():
+    index = profiles.AthleteIndex()
+    with pytest.raises(ValueError):
+        index.calculate('XXX', [1, 1, 1])
+    with pytest.raises(ValueError):
+        index.calculate('WLK', [1, 1, 1])
+
+
+def test_swimming_factor_without_power_of_two(monkeypatch):
+    monkeypatch.setattr(homework.Swimming, 'COEFF_SWM_2', 2.3)
+    index = profiles.AthleteIndex()
+    record = ('SWM', [720, 1.7, 81.3, 25, 40])
+    assert fields(index.calculate(*record)) == fields(
+        homework.read_package(*record).show_training_info())
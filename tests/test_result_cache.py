@@ -0,0 +1,56 @@
+import pytest
+
+import homework
+import result_cache
+
+
+def expected(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info()
+
+
+def test_result_cache_hits():
+    cache = result_cache.ResultCache(maxsize=2)
+    assert cache.get_info('RUN', [15000, 1, 75]) == expected(
+        'RUN', [15000, 1, 75])
+    assert cache.get_info('RUN', [15000.0, 1.0, 75.0]) == expected(
+        'RUN', [15000, 1, 75])
+    assert (cache.hits, cache.misses) == (1, 1), (
+        'Повторный пакет с тем же содержимым должен браться из кэша.'
+    )
+    assert cache.hit_rate == 0.5
+
+
+def test_result_cache_lru():
+    cache = result_cache.ResultCache(maxsize=2)
+    cache.get_info('RUN', [15000, 1, 75])
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    cache.get_info('RUN', [15000, 1, 75])
+    cache.get_info('SWM', [720, 1, 80, 25, 40])
+    assert list(cache.memory) == [
+        ('RUN', (15000.0, 1.0, 75.0)),
+        ('SWM', (720.0, 1.0, 80.0, 25.0, 40.0)),
+    ], 'Из кэша должно вытесняться самое давно использованное сообщение.'
+
+
+def test_result_cache_zero_bypass():
+    cache = result_cache.ResultCache()
+    info = cache.get_info('RUN', [-0.0, 1, 75])
+    assert info.get_message() == expected('RUN', [-0.0, 1, 75]).get_message()
+    assert not cache.memory
+
+
+def test_result_cache_disk(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    with result_cache.ResultCache(path=path) as cache:
+        cache.get_info('SWM', [720, 1, 80, 25, 40])
+    with result_cache.ResultCache(path=path) as cache:
+        info = cache.get_info('SWM', [720, 1, 80, 25, 40])
+        assert info == expected('SWM', [720, 1, 80, 25, 40])
+        assert (cache.disk_hits, cache.misses) == (1, 0), (
+            'Сообщение должно читаться из дискового кэша после перезапуска.'
+        )
+
+
+def test_result_cache_bad_size():
+    with pytest.raises(ValueError):
+        result_cache.ResultCache(maxsize=0)
@@ -0,0 +1,83 @@
+import pytest
+
+import homework
+import segments
+
+
+def test_segment_tracker_running_splits():
+    tracker = segments.SegmentTracker('RUN', 75, split=1.0)
+    splits = []
+    for second in range(1, 5001):
+        info = tracker.add(second, 1)
+        if info is not None:
+            splits.append(info)
+    last = tracker.finish()
+    assert len(splits) == 3, 'Неверное число отрезков по 1 км'
+    assert splits[0] == homework.Running(
+        1539, 1539 / 3600, 75).show_training_info(), (
+        'Отрезок должен закрываться на первом отсчёте после 1 км')
+    assert last == homework.Running(
+        5000 - 3 * 1539, (5000 - 3 * 1539) / 3600, 75).show_training_info(), (
+        'finish должен вернуть последний неполный отрезок')
+    assert tracker.finish() is None, 'Пустой отрезок не возвращается'
+    assert tracker.current() == homework.Running(
+        5000, 5000 / 3600, 75).show_training_info(), (
+        'Итог тренировки должен совпадать с расчётом по суммам')
+
+
+def test_segment_tracker_swimming_laps():
+    tracker = segments.SegmentTracker('SWM', 80, start=100, length_pool=25)
+    splits = [tracker.add(100 + 30 * lap, 12, laps=1) for lap in (1, 2, 3)]
+    assert splits == [homework.Swimming(12, 30 / 3600, 80, 25, 1)
+                      .show_training_info()] * 3, (
+        'Для плавания отрезок — один бассейн')
+    assert tracker.current() == homework.Swimming(
+        36, 90 / 3600, 80, 25, 3).show_training_info()
+
+
+def test_segment_tracker_rolling():
+    tracker = segments.SegmentTracker('RUN', 75, window=30)
+    for second in range(1, 601):
+        tracker.add(second, 1 if second <= 300 else 3)
+    rolling = tracker.rolling()
+    assert rolling.speed == pytest.approx(
+        homework.Running(3, 1 / 3600, 75).get_mean_speed(), rel=1e-3), (
+        'Скользящая скорость должна следовать за последними отсчётами')
+    assert tracker.current().speed < rolling.speed
+
+
+def test_segment_tracker_errors():
+    with pytest.raises(ValueError):
+        segments.SegmentTracker('XXX', 75)
+    with pytest.raises(ValueError):
+        segments.SegmentTracker('WLK', 75)
+    with pytest.raises(ValueError):
+        segments.SegmentTracker('RUN', 75, window=0)
+    tracker = segments.SegmentTracker('WLK', 75, start=10, height=180)
+    with pytest.raises(ValueError):
+        tracker.current()
+    with pytest.raises(ValueError):
+        tracker.rolling()
+    tracker.add(11, 2)
+    with pytest.raises(ValueError):
+        tracker.add(11, 2)
+
+
+def test_segment_tracker_has_no_dict():
+    tracker = segments.SegmentTracker('RUN', 75)
+    assert not hasattr(tracker, '__dict__'), (
+        'Трекер должен хранить только суммы в __slots__')
+
+
+def test_session_manager():
+    manager = segments.SessionManager(split=0.5)
+    for session in range(1000):
+        manager.start(session, 'RUN', 70)
+    for second in range(1, 401):
+        for session in range(1000):
+            manager.add(session, second, 2)
+    assert len(manager) == 1000
+    last, total = manager.finish(7)
+    assert total == homework.Running(800, 400 / 3600, 70).show_training_info()
+    assert last is not None
+    assert len(manager) == 999
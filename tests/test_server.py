@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import homework
+import server
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def expected_messages():
+    return [
+        homework.read_package(workout_type, data).show_training_info()
+        .get_message()
+        for workout_type, data in PACKAGES
+    ]
+
+
+def test_process_line():
+    response = json.loads(server.process_line(b'["RUN", [15000, 1, 75]]\n'))
+    assert response['message'] == expected_messages()[1], (
+        'Сервер должен возвращать сообщение о тренировке.'
+    )
+    assert response['training_type'] == 'Running'
+
+
+def test_process_line_errors():
+    for line in (b'not json', b'["XXX", [1, 1, 1]]', b'["RUN", [1, 1]]',
+                 b'["RUN", [1, 0, 1]]', b'5', b'["WLK", [1e200, 1e-10, 1, 1]]',
+                 b'[' * 100000 + b']' * 100000):
+        assert 'error' in json.loads(server.process_line(line)), (
+            'Ошибочный пакет должен возвращать ответ с ошибкой.'
+        )
+
+
+async def run_overflow_then_valid():
+    workout_server = server.WorkoutServer()
+    listener = await workout_server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        return await server.fake_device(
+            '127.0.0.1', port, [('WLK', [1e200, 1e-10, 1, 1]), PACKAGES[1]])
+
+
+async def run_long_then_valid():
+    workout_server = server.WorkoutServer(max_line=1024)
+    listener = await workout_server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        return await server.fake_device(
+            '127.0.0.1', port,
+            [('RUN', [1] * 5000), PACKAGES[1], ('RUN', [1] * 300),
+             PACKAGES[1]])
+
+
+def test_server_replies_to_long_package():
+    responses = asyncio.run(run_long_then_valid())
+    assert 'error' in responses[0] and 'error' in responses[2], (
+        'На слишком длинный пакет сервер должен отвечать ошибкой.'
+    )
+    assert responses[1]['message'] == expected_messages()[1]
+    assert responses[3]['message'] == expected_messages()[1], (
+        'После слишком длинного пакета соединение должно продолжать работать.'
+    )
+
+
+def test_server_keeps_connection_after_error():
+    responses = asyncio.run(run_overflow_then_valid())
+    assert 'error' in responses[0]
+    assert responses[1]['message'] == expected_messages()[1], (
+        'После ошибочного пакета соединение должно продолжать работать.'
+    )
+
+
+async def run_load(devices, **address):
+    workout_server = server.WorkoutServer(max_connections=8, queue_size=2)
+    if 'path' in address:
+        listener = await workout_server.start(path=address['path'])
+    else:
+        listener = await workout_server.start('127.0.0.1', 0)
+        address['host'] = '127.0.0.1'
+        address['port'] = listener.sockets[0].getsockname()[1]
+    async with listener:
+        responses = await server.run_fake_devices(
+            devices, PACKAGES * 5, **address)
+    return workout_server, responses
+
+
+def test_server_tcp():
+    workout_server, responses = asyncio.run(run_load(50))
+    assert len(responses) == 50
+    for device_responses in responses:
+        assert [response['message'] for response in device_responses] == (
+            expected_messages() * 5
+        ), 'Каждое устройство должно получить ответы в порядке пакетов.'
+    assert workout_server.processed == 50 * 15
+
+
+def test_server_unix(tmp_path):
+    path = str(tmp_path / 'workouts.sock')
+    _, responses = asyncio.run(run_load(3, path=path))
+    assert [response['message'] for response in responses[0]] == (
+        expected_messages() * 5
+    )
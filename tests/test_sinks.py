@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+
+import pytest
+from conftest import Capturing
+
+import homework
+import sinks
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+] * 3
+
+
+def messages():
+    return [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def test_main_sink():
+    out = io.StringIO()
+    with sinks.TextSink(out, batch_size=2) as sink:
+        for package in PACKAGES:
+            homework.main(homework.read_package(*package), sink)
+    with Capturing() as printed:
+        for package in PACKAGES:
+            homework.main(homework.read_package(*package))
+    assert out.getvalue().splitlines() == printed, (
+        '`main` с приёмником должен выводить те же строки, что и `print`.'
+    )
+    assert sink.count == len(PACKAGES)
+
+
+def test_json_lines_sink():
+    out = io.StringIO()
+    with sinks.JsonLinesSink(out, batch_size=4) as sink:
+        sink.write_many(messages())
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [homework.InfoMessage(**row) for row in rows] == messages()
+
+
+def test_csv_sink():
+    out = io.StringIO()
+    with sinks.CsvSink(out) as sink:
+        sink.write_many(messages())
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row['training_type'] for row in rows] == [
+        info.training_type for info in messages()]
+    assert float(rows[0]['calories']) == messages()[0].calories
+
+
+def test_binary_sink():
+    out = io.BytesIO()
+    with sinks.BinarySink(out, batch_size=4) as sink:
+        sink.write_many(messages())
+    assert list(sinks.read_binary(out.getvalue())) == messages(), (
+        'Двоичные столбцы должны читаться без потерь.'
+    )
+
+
+def test_batch_to_sink():
+    workout_types = [workout_type for workout_type, _ in PACKAGES]
+    columns = {field: [] for field in ('action', 'duration', 'weight',
+                                       'height', 'length_pool', 'count_pool')}
+    for workout_type, data in PACKAGES:
+        fields = homework.BASE_FIELDS + (
+            homework.TRAINING_TYPES[workout_type].EXTRA_FIELDS)
+        values = dict(zip(fields, data))
+        for field, column in columns.items():
+            column.append(values.get(field, 0))
+    result = homework.calculate_batch(workout_types, **columns)
+    out = io.BytesIO()
+    with sinks.BinarySink(out) as sink:
+        sink.write_many(homework.iter_batch_messages(
+            workout_types, columns['duration'], result))
+    assert list(sinks.read_binary(out.getvalue())) == messages()
+
+
+def test_background_sink():
+    out = io.StringIO()
+    with sinks.BackgroundSink(sinks.TextSink(out), batch_size=2,
+                              queue_size=1) as sink:
+        sink.write_many(messages())
+    assert out.getvalue().splitlines() == [
+        info.get_message() for info in messages()]
+
+
+def test_background_sink_error():
+    class BrokenSink(sinks.Sink):
+        def write_batch(self, batch):
+            raise OSError('диск заполнен')
+
+    sink = sinks.BackgroundSink(BrokenSink(batch_size=1), batch_size=1)
+    with pytest.raises(OSError):
+        sink.write_many(messages())
+        sink.close()
+    with pytest.raises(OSError):
+        sink.close()
+    assert not sink.thread.is_alive(), (
+        'После ошибки записи фоновый поток должен останавливаться.'
+    )
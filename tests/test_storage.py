@@ -0,0 +1,71 @@
+import pytest
+
+import homework
+import storage
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+def test_training_slots():
+    training = homework.Running(15000, 1, 75)
+    assert 'action' in homework.Training.__slots__, (
+        'Поля `Training` должны храниться в слотах.'
+    )
+    assert not training.__dict__, (
+        'Словарь атрибутов тренировки не должен заполняться при создании.'
+    )
+
+
+def test_workout_table_views():
+    table = storage.WorkoutTable(PACKAGES)
+    assert len(table) == len(PACKAGES)
+    for view, (workout_type, data) in zip(table, PACKAGES):
+        training = homework.read_package(workout_type, data)
+        assert view.get_distance() == training.get_distance()
+        assert view.get_mean_speed() == training.get_mean_speed()
+        assert view.get_spent_calories() == training.get_spent_calories()
+        assert view.show_training_info() == training.show_training_info(), (
+            'Представление записи таблицы должно давать то же сообщение, '
+            'что и объект тренировки.'
+        )
+        assert type(view.to_training()) is type(training)
+    assert table[-1].action == 1206
+
+
+def test_workout_table_calculate():
+    table = storage.WorkoutTable(PACKAGES)
+    result = table.calculate()
+    assert list(result.calories) == [
+        view.get_spent_calories() for view in table
+    ], 'Пакетный расчёт таблицы должен совпадать с расчётом по записям.'
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('XXX', [1, 1, 1]),
+    ('RUN', [1, 1]),
+    ('RUN', [1, 1, 'x']),
+    ('WLK', [1, 1, 1, None]),
+])
+def test_workout_table_bad_package(workout_type, data):
+    table = storage.WorkoutTable(PACKAGES)
+    with pytest.raises(ValueError):
+        table.append(workout_type, data)
+    assert all(
+        len(getattr(table, column)) == len(table)
+        for column in storage.COLUMNS
+    ), 'Неверный пакет не должен менять столбцы таблицы.'
+    assert list(table.calculate().calories) == [
+        view.get_spent_calories() for view in table
+    ], 'После неверного пакета таблица должна считаться как раньше.'
+
+
+def test_memory_report():
+    report = storage.memory_report(PACKAGES * 500)
+    assert report['WorkoutTable'] < report['Training'], (
+        'Таблица должна занимать меньше памяти, чем объекты тренировок.'
+    )
@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+
+import homework
+import streaming
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+
+
+def expected_messages(packages):
+    return [
+        homework.read_package(workout_type, data).show_training_info()
+        for workout_type, data in packages
+    ]
+
+
+@pytest.mark.parametrize('name, content', [
+    ('packages.csv',
+     'SWM,720,1,80,25,40\nRUN,15000,1,75\n\nWLK,9000,1.5,75,180\n'),
+    ('packages.jsonl',
+     '["SWM", [720, 1, 80, 25, 40]]\n'
+     '{"workout_type": "RUN", "data": [15000, 1, 75]}\n'
+     '\n'
+     '["WLK", [9000, 1.5, 75, 180]]\n'),
+])
+def test_stream_file(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    result = list(streaming.stream_file(path))
+    assert result == expected_messages(PACKAGES), (
+        'Потоковое чтение должно давать те же сообщения, '
+        'что и `read_package`.'
+    )
+
+
+def test_stream_is_lazy():
+    lines = itertools.cycle(['RUN,15000,1,75\n'])
+    messages = streaming.iter_messages(
+        streaming.iter_trainings(streaming.parse_lines(lines, 'csv')))
+    result = list(itertools.islice(messages, 3))
+    assert len(result) == 3, (
+        'Потоковое чтение должно обрабатывать пакеты по одному.'
+    )
+
+
+@pytest.mark.parametrize('fmt, lines', [
+    ('csv', ['RUN,abc,1,75\n', 'RUN,15000,1,75\n']),
+    ('jsonl', ['{"data": [1]}\n', '["RUN", [15000, 1, 75]]\n']),
+])
+def test_parse_lines_on_error(fmt, lines):
+    with pytest.raises(ValueError):
+        list(streaming.parse_lines(lines, fmt))
+    errors = []
+    records = list(streaming.parse_lines(
+        lines, fmt, lambda line, error: errors.append(line)))
+    assert records == [('RUN', [15000, 1, 75])], (
+        'С `on_error` неразобранная строка должна пропускаться.'
+    )
+    assert errors == [lines[0].rstrip('\n')]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        streaming.detect_format('packages.xml')
+
+
+def test_to_columns():
+    columns = streaming.to_columns(PACKAGES)
+    assert columns['workout_types'] == ['SWM', 'RUN', 'WLK']
+    assert columns['height'] == [0.0, 0.0, 180], (
+        'Поля, которых нет у тренировки, должны быть равны нулю.'
+    )
+    assert all(len(column) == len(PACKAGES) for column in columns.values())
+    result = homework.calculate_batch(**columns)
+    assert list(homework.iter_batch_messages(
+        columns['workout_types'], columns['duration'], result)) == (
+        expected_messages(PACKAGES))
@@ -0,0 +1,111 @@
+import io
+import json
+import math
+
+import pytest
+
+import homework
+import validation
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+]
+BAD_PACKAGES = [
+    (('XXX', [1, 1, 1]), validation.UNKNOWN_TYPE),
+    ((['RUN'], [1, 1, 1]), validation.UNKNOWN_TYPE),
+    (('RUN', [15000, 1]), validation.BAD_ARITY),
+    (('RUN', 15000), validation.BAD_ARITY),
+    (('RUN', [15000, '1', 75]), validation.NOT_A_NUMBER),
+    (('RUN', [15000, True, 75]), validation.NOT_A_NUMBER),
+    (('RUN', [15000, 1, -75]), validation.OUT_OF_RANGE),
+    (('RUN', [float('nan'), 1, 75]), validation.OUT_OF_RANGE),
+    (('RUN', [15000, 1, float('inf')]), validation.OUT_OF_RANGE),
+    (('WLK', [1e200, 1e-10, 1, 1]), validation.OUT_OF_RANGE),
+    (('RUN', [1e7, 1, 75]), validation.OUT_OF_RANGE),
+    (('WLK', [9000, 1, 75, 1e-300]), validation.OUT_OF_RANGE),
+    (('SWM', [720, 5e-324, 80, 25, 40]), validation.OUT_OF_RANGE),
+    (('RUN', [15000, 0, 75]), validation.ZERO_DIVISOR),
+    (('WLK', [9000, 1, 75, 0]), validation.ZERO_DIVISOR),
+    (('SWM', [720, 0.0, 80, 25, 40]), validation.ZERO_DIVISOR),
+]
+
+
+@pytest.mark.parametrize('package', PACKAGES)
+def test_validate_package_valid(package):
+    assert validation.validate_package(*package) is None
+
+
+@pytest.mark.parametrize('package, reason', BAD_PACKAGES)
+def test_validate_package_rejects(package, reason):
+    assert validation.validate_package(*package) == reason, (
+        'Проверка должна возвращать код причины отказа.'
+    )
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+@pytest.mark.parametrize('extreme', [
+    validation.MAX_VALUE, validation.MIN_DIVISOR])
+def test_validated_package_is_finite(workout_type, extreme):
+    arity, divisors = validation.get_rules(
+        validation.TRAINING_TYPES[workout_type])
+    data = [validation.MAX_VALUE] * arity
+    for index in divisors:
+        data[index] = extreme
+    assert validation.validate_package(workout_type, data) is None
+    info = homework.read_package(workout_type, data).show_training_info()
+    assert all(math.isfinite(value) for value in (
+        info.distance, info.speed, info.calories)), (
+        'Расчёт пакета, прошедшего проверку, не должен переполняться.'
+    )
+
+
+def test_validate_columns():
+    reasons = validation.validate_columns(
+        ['RUN', 'RUN', 'WLK', 'SWM', 'WLK', 'XXX', 'SWM'],
+        action=[15000, 15000, 9000, 720, 9000, 1, 720],
+        duration=[1, 0, 1, 1, 1, 1, -1],
+        weight=[75, 75, 75, 80, '75', 1, 80],
+        height=[0, 0, 180, 0, 0, 0, 0],
+        length_pool=[0, 0, 0, 25, 0, 0, 25],
+        count_pool=[0, 0, 0, 40, 0, 0, 40],
+    )
+    assert reasons == [
+        None, validation.ZERO_DIVISOR, None, None, validation.NOT_A_NUMBER,
+        validation.UNKNOWN_TYPE, validation.OUT_OF_RANGE,
+    ], 'Проверка столбцов должна возвращать причину отказа для записи.'
+
+
+def test_validate_columns_missing_values():
+    reasons = validation.validate_columns(
+        ['RUN', 'WLK', 'RUN', 'SWM'],
+        action=[15000, 9000, 15000],
+        duration=[1, 1, 1, 1],
+        weight=[75, 75, 75, 80],
+        count_pool=[0, 0, 0, 40],
+    )
+    assert reasons == [None, validation.BAD_ARITY, None,
+                       validation.BAD_ARITY], (
+        'Нехватка столбца или значения должна давать причину отказа.'
+    )
+
+
+def test_filter_valid():
+    dead_letter = validation.DeadLetterSink()
+    records = PACKAGES + [package for package, _ in BAD_PACKAGES]
+    assert list(validation.filter_valid(records, dead_letter)) == PACKAGES
+    assert dead_letter.records == BAD_PACKAGES, (
+        'Отклонённые пакеты должны попадать в приёмник с причиной.'
+    )
+    assert dead_letter.counts[validation.ZERO_DIVISOR] == 3
+
+
+def test_dead_letter_stream():
+    out = io.StringIO()
+    dead_letter = validation.DeadLetterSink(out)
+    dead_letter.put(('RUN', [15000, 0, 75]), validation.ZERO_DIVISOR)
+    assert json.loads(out.getvalue()) == {
+        'workout_type': 'RUN', 'data': [15000, 0, 75],
+        'reason': validation.ZERO_DIVISOR,
+    }
@@ -0,0 +1,161 @@
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from homework import BASE_FIELDS, TRAINING_TYPES, Training
+from streaming import Record
+
+UNKNOWN_TYPE: str = 'unknown_type'
+BAD_ARITY: str = 'bad_arity'
+NOT_A_NUMBER: str = 'not_a_number'
+OUT_OF_RANGE: str = 'out_of_range'
+ZERO_DIVISOR: str = 'zero_divisor'
+PARSE_ERROR: str = 'parse_error'
+
+NUMBER_TYPES = (int, float)
+# Границы параметров: при них расчёт любой тренировки остаётся
+# конечным, без переполнения и бесконечностей.
+MAX_VALUE: float = 1e6
+MIN_DIVISOR: float = 1e-3
+
+
+@lru_cache(maxsize=None)
+def get_rules(training_class: Type[Training]) -> Tuple[int, Tuple[int, ...]]:
+    """Получить число параметров и номера делителей класса тренировки."""
+    fields = BASE_FIELDS + training_class.EXTRA_FIELDS
+    return len(fields), tuple(fields.index(field)
+                              for field in training_class.NONZERO_FIELDS)
+
+
+def check_value(value: object) -> Optional[str]:
+    """Проверить, что параметр — число от 0 до `MAX_VALUE`."""
+    if value.__class__ not in NUMBER_TYPES:
+        return NOT_A_NUMBER
+    if not 0 <= value <= MAX_VALUE:
+        return OUT_OF_RANGE
+    return None
+
+
+def check_divisor(value: float) -> Optional[str]:
+    """Проверить делитель формул: он не меньше `MIN_DIVISOR`."""
+    if not value:
+        return ZERO_DIVISOR
+    if value < MIN_DIVISOR:
+        return OUT_OF_RANGE
+    return None
+
+
+def validate_package(workout_type: str, data: list) -> Optional[str]:
+    """Проверить пакет до создания тренировки.
+
+    Возвращает код причины отказа или None для корректного пакета.
+    """
+    try:
+        training_class = TRAINING_TYPES.get(workout_type)
+    except TypeError:
+        return UNKNOWN_TYPE
+    if training_class is None:
+        return UNKNOWN_TYPE
+    arity, divisors = get_rules(training_class)
+    if not isinstance(data, (list, tuple)) or len(data) != arity:
+        return BAD_ARITY
+    for value in data:
+        reason = check_value(value)
+        if reason is not None:
+            return reason
+    for index in divisors:
+        reason = check_divisor(data[index])
+        if reason is not None:
+            return reason
+    return None
+
+
+def validate_columns(workout_types: List[str],
+                     action: List[float],
+                     duration: List[float],
+                     weight: List[float],
+                     **columns: List[float],
+                     ) -> List[Optional[str]]:
+    """Проверить столбцы пакетов для `calculate_batch`.
+
+    Столбцы проверяются целиком по очереди для каждого типа тренировки.
+    Запись, для которой нет значения в нужном столбце (столбца нет
+    или он короче), получает причину `BAD_ARITY`. Возвращает причину
+    отказа для каждой записи или None.
+    """
+    reasons: List[Optional[str]] = [None] * len(workout_types)
+    groups: Dict[str, List[int]] = {}
+    for index, workout_type in enumerate(workout_types):
+        groups.setdefault(workout_type, []).append(index)
+    base = dict(zip(BASE_FIELDS, (action, duration, weight)))
+    for workout_type, indexes in groups.items():
+        training_class = TRAINING_TYPES.get(workout_type)
+        if training_class is None:
+            for index in indexes:
+                reasons[index] = UNKNOWN_TYPE
+            continue
+        for field in BASE_FIELDS + training_class.EXTRA_FIELDS:
+            column = base[field] if field in base else columns.get(field, ())
+            size = len(column)
+            nonzero = field in training_class.NONZERO_FIELDS
+            for index in indexes:
+                if reasons[index] is not None:
+                    continue
+                if index >= size:
+                    reasons[index] = BAD_ARITY
+                    continue
+                value = column[index]
+                reason = check_value(value)
+                if reason is None and nonzero:
+                    reason = check_divisor(value)
+                reasons[index] = reason
+    return reasons
+
+
+class DeadLetterSink:
+    """Приёмник отклонённых пакетов с кодами причин.
+
+    Пакеты пишутся строками JSON в `out` или, если поток не задан,
+    накапливаются в `records`; строки, которые не удалось разобрать, —
+    в `lines`. Число отказов по причинам — в `counts`.
+    """
+
+    def __init__(self, out: Optional[IO] = None) -> None:
+        self.out: Optional[IO] = out
+        self.records: List[Tuple[Record, str]] = []
+        self.lines: List[Tuple[str, str]] = []
+        self.counts: Counter = Counter()
+
+    def put_line(self, line: str, error: Exception) -> None:
+        """Принять строку, из которой не удалось разобрать пакет."""
+        self.counts[PARSE_ERROR] += 1
+        if self.out is None:
+            self.lines.append((line, str(error)))
+            return
+        self.out.write(json.dumps(
+            {'line': line, 'reason': PARSE_ERROR, 'error': str(error)},
+            ensure_ascii=False) + '\n')
+
+    def put(self, record: Record, reason: str) -> None:
+        """Принять отклонённый пакет."""
+        self.counts[reason] += 1
+        if self.out is None:
+            self.records.append((record, reason))
+            return
+        workout_type, data = record
+        self.out.write(json.dumps(
+            {'workout_type': workout_type, 'data': data, 'reason': reason},
+            ensure_ascii=False, default=repr) + '\n')
+
+
+def filter_valid(records: Iterable[Record],
+                 dead_letter: DeadLetterSink,
+                 ) -> Iterator[Record]:
+    """Пропустить корректные пакеты, остальные отправить в `dead_letter`."""
+    for record in records:
+        reason = validate_package(*record)
+        if reason is None:
+            yield record
+        else:
+            dead_letter.put(record, reason)